@@ -0,0 +1,53 @@
+from ml_model.src.features.stylometric import StylometricExtractor
+
+# ==================================================
+# DOCUMENT ANALYSIS (one tokenization pass per text)
+# ==================================================
+# Everything the feature stages read from a text's tokens, computed
+# once per text:
+#
+#   lower        text.lower(), shared by the TF-IDF analyzer, the
+#                NLTK word tokenizer and the readability syllables
+#   term_counts  {TF-IDF column: count}, from the vectorizer's own
+#                token pattern, stop words and n-gram range
+#                (CompactTfidf.term_counts)
+#   words        NLTK word tokens of the lowered text
+#   sentences    punkt sentences of the original text
+#
+# The TF-IDF and NLTK token streams cannot be merged into one: the
+# forest was trained on both exactly as they are, and they split
+# text differently ("don't" is "don" for the vectorizer and
+# "do" + "n't" for NLTK). What this stage removes is the repeated
+# work around them, so the features stay bit-identical.
+
+
+class DocumentAnalysis:
+
+    __slots__ = ("text", "lower", "term_counts", "words", "sentences")
+
+    def __init__(self, text, lower, term_counts, words, sentences):
+        self.text = text
+        self.lower = lower
+        self.term_counts = term_counts
+        self.words = words
+        self.sentences = sentences
+
+    @property
+    def tokens(self):
+        """
+        The (lower, words, sentences) triple StylometricExtractor.analyze_batch takes.
+        """
+        return self.lower, self.words, self.sentences
+
+
+def analyze_documents(tfidf, texts):
+    """
+    One DocumentAnalysis per text. tfidf is the context's CompactTfidf.
+    """
+    out = []
+    for text in texts:
+        lower = text.lower()
+        term_counts = tfidf.term_counts(lower if tfidf.lowercase else text, lowered=True)
+        words, sentences = StylometricExtractor.tokenize(text, lower)
+        out.append(DocumentAnalysis(text, lower, term_counts, words, sentences))
+    return out
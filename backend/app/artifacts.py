@@ -0,0 +1,117 @@
+"""
+Shared (memory-mapped) artifact bundle.
+
+    cd backend && python -m app.artifacts export
+
+writes models/shared/ from the three training pickles:
+
+    manifest.json            source artifact version
+    forest/*.npy             FlatForest node arrays
+    tfidf/                   CompactTfidf: sorted terms, idf.npy, config
+    label_encoder.pkl
+
+Workers that load the bundle map the large numeric arrays read-only,
+so N workers on a node share a single copy in the page cache instead
+of each unpickling a private forest.
+"""
+import json
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+
+import joblib
+
+from app.forest import FlatForest
+from app.tfidf import CompactTfidf
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+MODEL_DIR = BACKEND_DIR / "models"
+SHARED_DIR = MODEL_DIR / "shared"
+
+# Bumped when the bundle layout changes; older bundles are treated
+# as stale and the pickles are loaded instead
+BUNDLE_FORMAT = 2
+
+ARTIFACT_FILES = (
+    "text_origin_model.pkl",
+    "tfidf_vectorizer.pkl",
+    "label_encoder.pkl",
+)
+
+
+def artifact_version(model_dir=MODEL_DIR):
+    """
+    Fingerprint of the artifact files on disk; part of every
+    result-cache key so a reload never serves stale results.
+    """
+    digest = hashlib.sha1()
+    for name in ARTIFACT_FILES:
+        stat = (Path(model_dir) / name).stat()
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def export_bundle(model_dir=MODEL_DIR, out_dir=SHARED_DIR):
+    model_dir, out_dir = Path(model_dir), Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    forest = joblib.load(model_dir / "text_origin_model.pkl")
+    FlatForest.from_sklearn(forest).save(tmp_dir / "forest")
+
+    CompactTfidf.from_sklearn(joblib.load(model_dir / "tfidf_vectorizer.pkl")).save(tmp_dir / "tfidf")
+    shutil.copy2(model_dir / "label_encoder.pkl", tmp_dir / "label_encoder.pkl")
+
+    manifest = {"version": artifact_version(model_dir), "format": BUNDLE_FORMAT}
+    (tmp_dir / "manifest.json").write_text(json.dumps(manifest))
+
+    # Swap in the finished bundle in one step
+    shutil.rmtree(out_dir, ignore_errors=True)
+    tmp_dir.rename(out_dir)
+    return manifest["version"]
+
+
+def bundle_is_current(bundle_dir=SHARED_DIR, model_dir=MODEL_DIR):
+    """
+    True when a bundle exists and was exported from the pickles now in
+    model_dir (or the pickles are not deployed at all).
+    """
+    manifest_path = Path(bundle_dir) / "manifest.json"
+    if not manifest_path.exists():
+        return False
+
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("format") != BUNDLE_FORMAT:
+        return False
+
+    try:
+        source = artifact_version(model_dir)
+    except FileNotFoundError:
+        return True
+
+    return manifest["version"] == source
+
+
+def load_bundle(bundle_dir=SHARED_DIR):
+    """
+    Returns (version, forest, tfidf, label_encoder) with the numeric
+    arrays memory-mapped read-only.
+    """
+    bundle_dir = Path(bundle_dir)
+    manifest = json.loads((bundle_dir / "manifest.json").read_text())
+
+    forest = FlatForest.load(bundle_dir / "forest", mmap=True)
+    tfidf = CompactTfidf.load(bundle_dir / "tfidf", mmap=True)
+    label_encoder = joblib.load(bundle_dir / "label_encoder.pkl")
+
+    return manifest["version"], forest, tfidf, label_encoder
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["export"]:
+        sys.exit("usage: python -m app.artifacts export")
+
+    version = export_bundle()
+    print(f"✅ Exported shared bundle {version} to {SHARED_DIR}")
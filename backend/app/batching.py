@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+from app import inference
+from app.metrics import BATCH_SIZE, BATCH_WAIT_SECONDS
+from app.config import BATCH_WINDOW_MS, BATCH_MAX_SIZE, BATCH_QUEUE_LIMIT
+from app.model import predict_texts
+
+# ==================================================
+# MICRO-BATCHING (/api/predict)
+# ==================================================
+# Concurrent single-text requests are held for up to
+# BATCH_WINDOW_MS (or until BATCH_MAX_SIZE are waiting) and then
+# scored by one predict_texts call on the inference executor:
+# one TF-IDF transform, one stylometric matrix, one forest pass.
+# Each caller's future gets its own result back.
+
+
+class MicroBatcher:
+
+    def __init__(self, max_size=BATCH_MAX_SIZE, window_ms=BATCH_WINDOW_MS, queue_limit=BATCH_QUEUE_LIMIT):
+        self.max_size = max_size
+        self.window = window_ms / 1000
+        self.queue_limit = queue_limit
+
+        self._loop = None
+        self._pending = []
+        self._timer = None
+
+        # The loop only keeps weak references to tasks; an unreferenced
+        # one can be collected and leave its callers waiting forever
+        self._tasks = set()
+
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self):
+        return len(self._pending)
+
+    async def predict(self, text, explain):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First call, or a new event loop (e.g. after a restart)
+            self._loop, self._pending, self._timer = loop, [], None
+            self._tasks = set()
+
+        if len(self._pending) >= self.queue_limit:
+            raise inference.InferenceBusy()
+
+        future = loop.create_future()
+        self._pending.append((text, explain, future, time.monotonic()))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        now = time.monotonic()
+        waits = [now - queued for *_, queued in batch]
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.total_wait += sum(waits)
+        self.max_wait = max(self.max_wait, max(waits))
+
+        BATCH_SIZE.observe(len(batch))
+        for wait in waits:
+            BATCH_WAIT_SECONDS.observe(wait)
+
+        # One executor call per explain flag present in the batch
+        groups = {}
+        for text, explain, future, _ in batch:
+            groups.setdefault(explain, []).append((text, future))
+
+        for explain, items in groups.items():
+            task = self._loop.create_task(self._run(explain, items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, explain, items):
+        texts = [text for text, _ in items]
+        try:
+            results = await inference.submit(predict_texts, texts, explain)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "mean_wait_ms": round(1000 * self.total_wait / self.items, 3) if self.items else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 3),
+        }
+
+
+batcher = MicroBatcher()
+
+
+async def predict_one(text, explain):
+    """
+    predict_text through the micro-batcher, or directly on the
+    inference executor when batching is disabled (window 0).
+    """
+    if BATCH_WINDOW_MS <= 0:
+        return (await inference.submit(predict_texts, [text], explain))[0]
+    return await batcher.predict(text, explain)
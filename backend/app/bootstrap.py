@@ -0,0 +1,22 @@
+"""
+One-off resource bootstrap, e.g. at image build time:
+
+    cd backend && python -m app.bootstrap
+
+Downloads any missing NLTK data and loads the model artifacts once
+to check they are usable, so web workers start without network access.
+"""
+from app.model import warm_up
+from ml_model.src.resources import ensure_nltk_resources
+
+
+def main():
+    ensure_nltk_resources(download=True)
+    print("✅ NLTK data present")
+
+    warm_up()
+    print("✅ Model artifacts load and predict")
+
+
+if __name__ == "__main__":
+    main()
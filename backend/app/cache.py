@@ -0,0 +1,82 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# ==================================================
+# PREDICTION RESULT CACHE
+# ==================================================
+
+class ResultCache:
+    """
+    Bounded LRU cache with per-entry TTL and hit/miss counters.
+    A maxsize of 0 disables caching.
+    """
+
+    def __init__(self, maxsize=4096, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        if not self.maxsize:
+            return None
+
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is not None and self.ttl and entry[0] < time.monotonic():
+                del self._data[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if not self.maxsize:
+            return
+
+        expires = time.monotonic() + self.ttl if self.ttl else float("inf")
+
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def text_key(text, *parts):
+    """
+    Cache key for a text plus whatever else the result depends on.
+
+    The text is hashed byte-for-byte: stylometric features such as
+    char_count and capital_ratio see every whitespace and case change,
+    so folding them would merge inputs that score differently.
+    """
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16)
+    for part in parts:
+        digest.update(b"\0" + str(part).encode("utf-8"))
+    return digest.hexdigest()
@@ -0,0 +1,85 @@
+import os
+import sys
+
+from app.config import (
+    CPU_COUNT, WEB_WORKERS, MODEL_THREADS, THREADPOOL_SIZE, INFERENCE_WORKERS,
+    EXPLAIN_WORKERS, EXTRACT_WORKERS
+)
+
+# ==================================================
+# CONCURRENCY (thread pools sized from one config)
+# ==================================================
+# The forest is pickled with n_jobs=-1 and NumPy's BLAS starts one
+# thread per core, so every concurrent model call in every worker
+# would fan out across all cores. Here each call is held to
+# MODEL_THREADS threads instead, and concurrency comes from the
+# request threads / inference processes (see app/config.py).
+
+_THREAD_ENV = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+_limits = None
+
+
+def limit_threads():
+    """
+    Caps BLAS / OpenMP pools (threadpoolctl) and torch intra-op
+    threads in this process at MODEL_THREADS, and exports the same
+    limit to child processes. Safe to call more than once.
+    """
+    global _limits
+    if not MODEL_THREADS:
+        return
+
+    for name in _THREAD_ENV:
+        os.environ.setdefault(name, str(MODEL_THREADS))
+
+    if _limits is None:
+        from threadpoolctl import threadpool_limits
+        _limits = threadpool_limits(limits=MODEL_THREADS)
+
+    # Only if something already imported it; torch is not an app
+    # dependency
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(MODEL_THREADS)
+
+
+def configure_estimator(estimator):
+    """
+    Sets inference-time n_jobs on a loaded estimator (the pickle
+    keeps whatever training used). Returns the estimator.
+    """
+    if MODEL_THREADS and hasattr(estimator, "n_jobs"):
+        estimator.n_jobs = MODEL_THREADS
+    return estimator
+
+
+def configure_threadpool():
+    """
+    Resizes anyio's default threadpool; call from the event loop
+    (the app's lifespan).
+    """
+    if THREADPOOL_SIZE:
+        import anyio.to_thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+
+def plan():
+    """
+    The effective sizing, as reported by /api/health.
+    """
+    return {
+        "cpus": CPU_COUNT,
+        "web_workers": WEB_WORKERS,
+        "inference_workers": INFERENCE_WORKERS,
+        "threadpool_size": THREADPOOL_SIZE or None,
+        "model_threads": MODEL_THREADS or None,
+        "explain_workers": EXPLAIN_WORKERS,
+        "extract_workers": EXTRACT_WORKERS,
+    }
@@ -0,0 +1,170 @@
+import os
+
+# ==================================================
+# RUNTIME SETTINGS (overridable through environment)
+# ==================================================
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_str(name, default):
+    return os.getenv(name, default).strip().lower()
+
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# Largest number of texts accepted by /api/predict-batch
+MAX_BATCH_SIZE = _env_int("ORIGINAI_MAX_BATCH_SIZE", 5000)
+
+# Token explanation strategy:
+#   "shap"   - full TreeSHAP over every feature column; needs the
+#              sklearn pickle, which every worker then unpickles
+#   "sparse" - decision-path attribution over the document's own
+#              nonzero TF-IDF terms (much cheaper on short texts)
+#   "auto"   - sparse when the shared bundle is loaded, so workers
+#              keep to the memory-mapped forest; shap otherwise
+EXPLAIN_MODE = _env_str("ORIGINAI_EXPLAIN_MODE", "auto")
+
+# Number of tokens returned in an explanation
+TOP_K_TOKENS = _env_int("ORIGINAI_TOP_K_TOKENS", 10)
+
+# Background threads computing explain=async jobs
+EXPLAIN_WORKERS = _env_int("ORIGINAI_EXPLAIN_WORKERS", 1)
+
+# Finished/pending async explanations kept before the oldest are
+# dropped (a dropped job that has not started is cancelled)
+EXPLAIN_JOB_LIMIT = _env_int("ORIGINAI_EXPLAIN_JOB_LIMIT", 10000)
+
+# Async explanations waiting or running before explain=async
+# requests are refused with 429
+EXPLAIN_QUEUE_SIZE = _env_int("ORIGINAI_EXPLAIN_QUEUE_SIZE", 1000)
+
+# Prediction result cache (entries, seconds); size 0 disables it
+CACHE_SIZE = _env_int("ORIGINAI_CACHE_SIZE", 4096)
+CACHE_TTL = _env_int("ORIGINAI_CACHE_TTL", 3600)
+
+# POS backend for the stylometric ratios:
+#   "nltk"    - averaged perceptron tagger (what the model was trained on)
+#   "lexicon" - word lookup + suffix rules (ml_model/build_pos_lexicon.py)
+POS_BACKEND = _env_str("ORIGINAI_POS_BACKEND", "nltk")
+
+# Load artifacts in the background when the app starts instead of
+# on the first request; /api/health reports when this has finished
+WARMUP = _env_bool("ORIGINAI_WARMUP", True)
+
+# Allow the server to download missing NLTK data at load time.
+# Off by default so workers never reach the network; provision the
+# data with `python -m app.bootstrap` at image build time instead.
+NLTK_DOWNLOAD = _env_bool("ORIGINAI_NLTK_DOWNLOAD", False)
+
+# Load models/shared/ (python -m app.artifacts export) when it matches
+# the pickles: memory-mapped arrays shared by all workers on a node
+USE_SHARED_ARTIFACTS = _env_bool("ORIGINAI_SHARED_ARTIFACTS", True)
+
+# Forest inference engine:
+#   "flat"    - app/forest.py node arrays, evaluated directly on CSR rows
+#   "sklearn" - RandomForestClassifier.predict_proba
+#   "auto"    - flat for calls of fewer than FLAT_MAX_ROWS rows
+#               (single texts, small micro-batches), sklearn's C
+#               traversal for larger batches. Workers on the shared
+#               bundle have no sklearn forest loaded and stay on flat.
+FOREST_ENGINE = _env_str("ORIGINAI_FOREST_ENGINE", "auto")
+FLAT_MAX_ROWS = _env_int("ORIGINAI_FLAT_MAX_ROWS", 32)
+
+# Confidence cascade, off by default: the first CASCADE_TREES trees
+# score every text, and only texts they are unsure about (top
+# probability below CASCADE_MIN_CONFIDENCE, or top-2 gap below
+# CASCADE_MIN_MARGIN) run the remaining trees. Texts under the
+# short-text gate never escalate. Applied on either forest engine,
+# so batch size does not change a text's result. Early exits
+# return first-tier confidences; check benchmarks/cascade.py on
+# the deployed model before enabling. 0 disables the cascade.
+CASCADE_TREES = _env_int("ORIGINAI_CASCADE_TREES", 0)
+CASCADE_MIN_CONFIDENCE = _env_float("ORIGINAI_CASCADE_MIN_CONFIDENCE", 0.70)
+CASCADE_MIN_MARGIN = _env_float("ORIGINAI_CASCADE_MIN_MARGIN", 0.15)
+
+# Prediction history and explain=async job status:
+#   "sqlite" - HISTORY_PATH, shared by all workers on the host
+#   "memory" - per process (explanations then need sticky routing)
+HISTORY_BACKEND = _env_str("ORIGINAI_HISTORY_BACKEND", "sqlite")
+HISTORY_PATH = os.getenv("ORIGINAI_HISTORY_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "history.db"
+)
+
+# Entries kept before the oldest are evicted
+HISTORY_LIMIT = _env_int("ORIGINAI_HISTORY_LIMIT", 10000)
+
+# Default and largest page returned by /api/history
+HISTORY_PAGE_SIZE = _env_int("ORIGINAI_HISTORY_PAGE_SIZE", 50)
+HISTORY_MAX_PAGE_SIZE = _env_int("ORIGINAI_HISTORY_MAX_PAGE_SIZE", 500)
+
+# How long the sqlite writer collects entries before committing them
+HISTORY_FLUSH_SECONDS = _env_float("ORIGINAI_HISTORY_FLUSH_SECONDS", 0.2)
+
+# /api/predict-file limits: upload size, PDF pages, characters of
+# extracted text passed to the model (0 disables a limit)
+MAX_UPLOAD_BYTES = _env_int("ORIGINAI_MAX_UPLOAD_BYTES", 20 * 1024 * 1024)
+MAX_PDF_PAGES = _env_int("ORIGINAI_MAX_PDF_PAGES", 300)
+MAX_EXTRACT_CHARS = _env_int("ORIGINAI_MAX_EXTRACT_CHARS", 1_000_000)
+
+# Processes extracting PDF pages in parallel; 1 extracts in the
+# request thread
+EXTRACT_WORKERS = _env_int("ORIGINAI_EXTRACT_WORKERS", 1)
+
+# Long-document mode (uploaded files): documents of at least
+# LONG_TEXT_WORDS words are scored as sentence-aligned segments of
+# about SEGMENT_WORDS words (never fewer than MIN_SEGMENT_WORDS,
+# except for a document made of a single short segment)
+LONG_TEXT_WORDS = _env_int("ORIGINAI_LONG_TEXT_WORDS", 400)
+SEGMENT_WORDS = _env_int("ORIGINAI_SEGMENT_WORDS", 200)
+MIN_SEGMENT_WORDS = _env_int("ORIGINAI_MIN_SEGMENT_WORDS", 60)
+
+# CPU sizing (app/concurrency.py). CPU_COUNT cores are shared by
+# WEB_WORKERS server processes (pass the same number to uvicorn
+# --workers). Each model call gets MODEL_THREADS threads: the n_jobs
+# of loaded estimators, the BLAS / OpenMP pools (threadpoolctl) and
+# torch intra-op threads. The default of 1 lets concurrent requests,
+# not one request's inner loops, use the cores. 0 leaves every pool
+# at its library default (n_jobs from the pickle, one BLAS thread
+# per core).
+CPU_COUNT = _env_int("ORIGINAI_CPUS", os.cpu_count() or 1)
+WEB_WORKERS = max(1, _env_int("ORIGINAI_WEB_WORKERS", 1))
+MODEL_THREADS = _env_int("ORIGINAI_MODEL_THREADS", 1)
+
+# Starlette / anyio threadpool running sync routes and in-process
+# model calls; defaults to two threads per core of this worker's
+# share, at least 8 so health checks and uploads are not starved.
+# 0 keeps anyio's default (40).
+THREADPOOL_SIZE = _env_int("ORIGINAI_THREADPOOL_SIZE", max(8, 2 * (CPU_COUNT // WEB_WORKERS)))
+
+# Inference executor: 0 runs model calls in this process (Starlette
+# threadpool); N > 0 runs them in N worker processes, each holding
+# its own copy of the artifacts (see app/inference.py)
+INFERENCE_WORKERS = _env_int("ORIGINAI_INFERENCE_WORKERS", 0)
+
+# Model calls in flight before requests are refused with 429
+INFERENCE_QUEUE_SIZE = _env_int("ORIGINAI_INFERENCE_QUEUE_SIZE", 64)
+
+# Micro-batching of concurrent /api/predict calls: wait up to
+# BATCH_WINDOW_MS (0 disables batching) or BATCH_MAX_SIZE texts,
+# then score them together. More than BATCH_QUEUE_LIMIT waiting
+# texts are refused with 429.
+BATCH_WINDOW_MS = _env_float("ORIGINAI_BATCH_WINDOW_MS", 5.0)
+BATCH_MAX_SIZE = _env_int("ORIGINAI_BATCH_MAX_SIZE", 32)
+BATCH_QUEUE_LIMIT = _env_int("ORIGINAI_BATCH_QUEUE_LIMIT", 1024)
+
+# Stage timers, request histograms and /metrics; off skips all
+# recording on the request path
+METRICS_ENABLED = _env_bool("ORIGINAI_METRICS", True)
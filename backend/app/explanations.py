@@ -0,0 +1,226 @@
+import json
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app import inference
+from app.config import (
+    EXPLAIN_WORKERS, EXPLAIN_JOB_LIMIT, EXPLAIN_QUEUE_SIZE, HISTORY_BACKEND, HISTORY_PATH
+)
+from app.model import explain_text
+
+# ==================================================
+# DEFERRED EXPLANATIONS (explain=async)
+# ==================================================
+# Jobs run in the process that accepted the request. With the
+# sqlite history backend their status and tokens are also written
+# to an explanations table in HISTORY_PATH, so /api/explain/{id}
+# answers from any uvicorn worker on the host. With the memory
+# backend only the accepting worker knows the id, and clients
+# must be routed back to it.
+#
+# Jobs queue here, in front of EXPLAIN_WORKERS threads. With the
+# inference process pool enabled each thread hands its job to the
+# pool and waits for it, so at most EXPLAIN_WORKERS explanations
+# sit in the pool's queue ahead of /api/predict calls.
+#
+# At most EXPLAIN_QUEUE_SIZE jobs are waiting or running. Routes
+# claim their slots with reserve_explanations() before running
+# inference (InferenceBusy, HTTP 429, when they are taken) and then
+# fill them with submit_explanations().
+
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=EXPLAIN_WORKERS,
+    thread_name_prefix="explain"
+)
+
+_JOBS = OrderedDict()
+_LOCK = threading.Lock()
+_pending = 0
+
+
+class SqliteJobs:
+    """
+    Job status rows shared by the workers on a host. Rows past
+    `limit` are trimmed oldest first, like the in-process store.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS explanations (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            status TEXT NOT NULL,
+            shap TEXT
+        );
+    """
+
+    def __init__(self, path=HISTORY_PATH, limit=EXPLAIN_JOB_LIMIT):
+        self.path = str(path)
+        self.limit = limit
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self._SCHEMA)
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections are not shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, job_ids):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO explanations (id, status) VALUES (?, 'pending')",
+                [(job_id,) for job_id in job_ids]
+            )
+            conn.execute(
+                "DELETE FROM explanations WHERE seq <= (SELECT MAX(seq) FROM explanations) - ?",
+                (self.limit,)
+            )
+
+    def finish(self, job_id, status, shap):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE explanations SET status = ?, shap = ? WHERE id = ?",
+                (status, json.dumps(shap), job_id)
+            )
+
+    def get(self, job_id):
+        row = self._connect().execute(
+            "SELECT status, shap FROM explanations WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"id": job_id, "status": row[0], "shap": json.loads(row[1]) if row[1] else []}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _get_store():
+    global _store
+    if _store is None and HISTORY_BACKEND == "sqlite":
+        with _store_lock:
+            if _store is None:
+                _store = SqliteJobs()
+    return _store
+
+
+def _run_job(text, segmented):
+    pool = inference.get_pool()
+    if pool is None:
+        return explain_text(text, segmented)
+    return pool.submit(explain_text, text, segmented).result()
+
+
+def _status(job_id, future):
+    if not future.done():
+        return {"id": job_id, "status": "pending", "shap": []}
+
+    if future.cancelled() or future.exception() is not None:
+        return {"id": job_id, "status": "failed", "shap": []}
+
+    return {"id": job_id, "status": "done", "shap": future.result()}
+
+
+def _job_done(job_id, future):
+    release_explanations(1)
+
+    # Evicted and cancelled: its row has been trimmed already
+    store = _get_store()
+    if store is None or future.cancelled():
+        return
+
+    result = _status(job_id, future)
+    try:
+        store.finish(job_id, result["status"], result["shap"])
+    except sqlite3.Error:
+        # Still answered by this worker from _JOBS
+        pass
+
+
+def reserve_explanations(n):
+    """
+    Claims n job slots, all or none. Raises InferenceBusy when fewer
+    than n are free.
+    """
+    global _pending
+    with _LOCK:
+        if _pending + n > EXPLAIN_QUEUE_SIZE:
+            raise inference.InferenceBusy()
+        _pending += n
+
+
+def release_explanations(n):
+    """
+    Returns slots claimed by reserve_explanations() that will not
+    be used.
+    """
+    global _pending
+    with _LOCK:
+        _pending -= n
+
+
+def submit_explanations(texts, segmented=False):
+    """
+    Queues an explanation for each text, on slots already claimed
+    with reserve_explanations(len(texts)), and returns their ids.
+
+    segmented=True explains long texts the way predict_document
+    scores them (see explain_text).
+
+    Writes to the shared store, so call it from a worker thread,
+    not the event loop.
+    """
+    ids = [uuid.uuid4().hex for _ in texts]
+    evicted = []
+
+    # Visible to every worker before any job can finish
+    store = _get_store()
+    if store is not None:
+        try:
+            store.add(ids)
+        except sqlite3.Error:
+            # Best effort, like history; this worker still answers
+            pass
+
+    for job_id, text in zip(ids, texts):
+        future = _EXECUTOR.submit(_run_job, text, segmented)
+        future.add_done_callback(lambda f, job_id=job_id: _job_done(job_id, f))
+
+        with _LOCK:
+            _JOBS[job_id] = future
+
+            # Forget the oldest jobs once the store is full
+            while len(_JOBS) > EXPLAIN_JOB_LIMIT:
+                evicted.append(_JOBS.popitem(last=False)[1])
+
+    # Nobody can ask for these any more; skip them if not started
+    for future in evicted:
+        future.cancel()
+
+    return ids
+
+
+def get_explanation(job_id):
+    """
+    Returns the job status and tokens, or None for unknown ids.
+    Jobs of this worker are answered from memory, others from the
+    shared store.
+    """
+    with _LOCK:
+        future = _JOBS.get(job_id)
+
+    if future is not None:
+        return _status(job_id, future)
+
+    store = _get_store()
+    return store.get(job_id) if store is not None else None
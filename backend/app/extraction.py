@@ -0,0 +1,192 @@
+import codecs
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import (
+    MAX_UPLOAD_BYTES, MAX_PDF_PAGES, MAX_EXTRACT_CHARS, EXTRACT_WORKERS
+)
+
+# ==================================================
+# DOCUMENT TEXT EXTRACTION (/api/predict-file)
+# ==================================================
+# The upload is copied in chunks to a temp file (refused past
+# MAX_UPLOAD_BYTES), then read back one page / paragraph / chunk
+# at a time. PDF pages are split across EXTRACT_WORKERS processes
+# when more than one is configured; text is yielded in page order
+# and extraction stops once MAX_EXTRACT_CHARS have been produced.
+
+SUPPORTED_TYPES = (".txt", ".pdf", ".docx")
+
+_CHUNK_BYTES = 1 << 20
+_PAGES_PER_TASK = 8
+
+
+class ExtractionError(ValueError):
+    """Upload rejected: unsupported, too large or unreadable"""
+
+    def __init__(self, detail, status_code=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def file_kind(filename):
+    for suffix in SUPPORTED_TYPES:
+        if filename.lower().endswith(suffix):
+            return suffix[1:]
+    raise ExtractionError("Unsupported file type")
+
+
+def spool(source, max_bytes=MAX_UPLOAD_BYTES):
+    """
+    Copies a binary file object to a named temp file, chunk by chunk,
+    and returns its path. The caller deletes it.
+    """
+    out = tempfile.NamedTemporaryFile(prefix="originai-", delete=False)
+    written = 0
+    try:
+        with out:
+            while True:
+                chunk = source.read(_CHUNK_BYTES)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if max_bytes and written > max_bytes:
+                    raise ExtractionError(
+                        f"File too large (max {max_bytes} bytes)", status_code=413
+                    )
+                out.write(chunk)
+    except BaseException:
+        os.unlink(out.name)
+        raise
+    return out.name
+
+
+# ----------------------------------------------
+# Per-format page iterators
+# ----------------------------------------------
+
+def _iter_txt(path):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def _iter_docx(path):
+    import docx
+
+    for paragraph in docx.Document(path).paragraphs:
+        if paragraph.text:
+            yield paragraph.text
+
+
+def _pdf_pages(path, start, stop):
+    # Runs in a worker process; each opens the file itself
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: workers must not inherit the server's threads and locks
+                _pool = ProcessPoolExecutor(
+                    max_workers=EXTRACT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def _iter_pdf(path):
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path)
+    n_pages = len(reader.pages)
+
+    if MAX_PDF_PAGES and n_pages > MAX_PDF_PAGES:
+        raise ExtractionError(f"PDF too long (max {MAX_PDF_PAGES} pages)", status_code=413)
+
+    if EXTRACT_WORKERS <= 1 or n_pages <= _PAGES_PER_TASK:
+        for page in reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    pool = _get_pool()
+    futures = [
+        pool.submit(_pdf_pages, path, start, min(start + _PAGES_PER_TASK, n_pages))
+        for start in range(0, n_pages, _PAGES_PER_TASK)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+_ITERATORS = {"txt": _iter_txt, "pdf": _iter_pdf, "docx": _iter_docx}
+
+
+def iter_text(path, kind):
+    """
+    Yields the document's text piece by piece (chunk, page or paragraph).
+    """
+    return _ITERATORS[kind](path)
+
+
+def extract_text(path, kind, max_chars=MAX_EXTRACT_CHARS):
+    """
+    Whole document text, pages/paragraphs joined by a space, cut at
+    max_chars (0 = no limit).
+    """
+    separator = "" if kind == "txt" else " "
+    parts, total = [], 0
+
+    pieces = iter_text(path, kind)
+    try:
+        for piece in pieces:
+            if not piece:
+                continue
+            parts.append(piece)
+            total += len(piece) + len(separator)
+            if max_chars and total >= max_chars:
+                break
+    finally:
+        pieces.close()
+
+    text = separator.join(parts)
+    return text[:max_chars] if max_chars else text
+
+
+def extract_upload(source, filename):
+    """
+    Spools an uploaded file object and returns its text.
+    Blocking; call it off the event loop.
+    """
+    kind = file_kind(filename)
+    path = spool(source)
+    try:
+        return extract_text(path, kind)
+    except ExtractionError:
+        raise
+    except Exception:
+        raise ExtractionError(f"Could not read {kind} file")
+    finally:
+        os.unlink(path)
+
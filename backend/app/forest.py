@@ -0,0 +1,181 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+# ==================================================
+# FLAT-ARRAY RANDOM FOREST
+# ==================================================
+# All trees of a fitted RandomForestClassifier concatenated into
+# contiguous node arrays. Saved as plain .npy files so every worker
+# can np.load(..., mmap_mode="r") them and share one copy through
+# the OS page cache (sklearn's Tree copies its nodes on unpickle).
+
+_ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+
+
+class FlatForest:
+
+    def __init__(self, feature, threshold, left, right, value, roots, n_features, max_depth):
+        self.feature = feature          # int32, split feature (-1 at leaves)
+        self.threshold = threshold      # float64, go left when x <= threshold
+        self.left = left                # int32, global index (self at leaves)
+        self.right = right              # int32, global index (self at leaves)
+        self.value = value              # float64 (n_nodes, n_classes), class probabilities
+        self.roots = roots              # int32, root node of each tree
+        self.n_features = n_features
+        self.max_depth = max_depth
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_classes(self):
+        return self.value.shape[1]
+
+    def subset(self, start, stop):
+        """
+        A forest of trees [start, stop) sharing this one's node
+        arrays (nothing is copied).
+        """
+        return FlatForest(
+            self.feature, self.threshold, self.left, self.right, self.value,
+            self.roots[start:stop], self.n_features, self.max_depth
+        )
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for est in forest.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            ids = np.arange(n)
+            leaf = tree.children_left == -1
+
+            value = tree.value[:, 0, :]
+            values.append(value / value.sum(axis=1, keepdims=True))
+
+            features.append(np.where(leaf, -1, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(leaf, ids, tree.children_left) + offset)
+            rights.append(np.where(leaf, ids, tree.children_right) + offset)
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            np.concatenate(features).astype(np.int32),
+            np.concatenate(thresholds).astype(np.float64),
+            np.concatenate(lefts).astype(np.int32),
+            np.concatenate(rights).astype(np.int32),
+            np.concatenate(values).astype(np.float64),
+            np.asarray(roots, dtype=np.int32),
+            n_features=int(forest.n_features_in_),
+            max_depth=int(max_depth),
+        )
+
+    def save(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+
+        meta = {"n_features": self.n_features, "max_depth": self.max_depth}
+        (directory / "forest.json").write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        directory = Path(directory)
+        meta = json.loads((directory / "forest.json").read_text())
+        mode = "r" if mmap else None
+
+        arrays = [np.load(directory / f"{name}.npy", mmap_mode=mode) for name in _ARRAYS]
+        return cls(*arrays, **meta)
+
+    # ----------------------------------------------
+    # Inference
+    # ----------------------------------------------
+
+    def _walk(self, X, on_step=None):
+        """
+        Routes every row of CSR matrix X through every tree, one depth
+        level at a time, reading feature values straight from the CSR
+        arrays (no densifying). Only (row, tree) pairs that have not
+        reached a leaf are carried to the next level.
+
+        Returns the (rows, trees) leaf indices.
+        """
+        X = X.tocsr()
+        if not X.has_sorted_indices:
+            X = X.sorted_indices()
+
+        n_rows, n_cols = X.shape
+        n_trees = self.n_trees
+
+        # Sorted (row, column) keys of the stored entries; for a single
+        # row the column indices already are the keys
+        if n_rows == 1:
+            keys = X.indices.astype(np.int64)
+        else:
+            row_ids = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(X.indptr))
+            keys = row_ids * n_cols + X.indices
+        vals = X.data.astype(np.float32)
+
+        node = np.tile(self.roots, n_rows)
+        row_base = np.repeat(np.arange(n_rows, dtype=np.int64) * n_cols, n_trees)
+        active = np.arange(node.size)
+
+        while active.size:
+            current = node[active]
+            feat = self.feature[current]
+
+            split = feat >= 0
+            if not split.all():
+                active, current, feat = active[split], current[split], feat[split]
+                if not active.size:
+                    break
+
+            query = row_base[active] + feat
+            x = np.zeros(query.shape, dtype=np.float32)
+
+            if keys.size:
+                pos = np.minimum(np.searchsorted(keys, query), keys.size - 1)
+                hit = keys[pos] == query
+                x[hit] = vals[pos[hit]]
+
+            nxt = np.where(x <= self.threshold[current], self.left[current], self.right[current])
+
+            if on_step is not None:
+                on_step(current, nxt, feat)
+
+            node[active] = nxt
+
+        return node.reshape(n_rows, n_trees)
+
+    def apply(self, X):
+        return self._walk(X)
+
+    def predict_proba(self, X):
+        leaves = self._walk(X)
+        return self.value[leaves].mean(axis=1)
+
+    def path_contributions(self, X_row, class_idx):
+        """
+        Per-feature change in class probability along the decision
+        path of a single row, averaged over trees.
+        """
+        contrib = np.zeros(self.n_features, dtype=np.float64)
+        value = self.value[:, class_idx]
+        n_trees = self.n_trees
+
+        def on_step(node, nxt, feat):
+            np.add.at(contrib, feat, (value[nxt] - value[node]) / n_trees)
+
+        self._walk(X_row, on_step)
+        return contrib
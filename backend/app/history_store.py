@@ -1,14 +1,267 @@
+import queue
+import sqlite3
+import threading
+from collections import deque
 from datetime import datetime
 
-_HISTORY = []
+from app.config import (
+    HISTORY_BACKEND, HISTORY_PATH, HISTORY_LIMIT, HISTORY_FLUSH_SECONDS
+)
 
-def add_history(text, label, confidence):
-    _HISTORY.insert(0, {
+# ==================================================
+# PREDICTION HISTORY
+# ==================================================
+# Newest first, bounded to HISTORY_LIMIT entries, paged by id:
+# get_history(cursor=N) returns entries older than id N together
+# with the cursor for the next page (None on the last page).
+#
+#   "sqlite" - WAL-mode file shared by every worker on the host,
+#              written in batches by a background thread
+#   "memory" - per-process ring buffer
+
+
+def _entry(text, label, confidence):
+    now = datetime.now()
+    return {
         "text_preview": text[:120] + "..." if len(text) > 120 else text,
         "label": label,
         "confidence": confidence,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M")
-    })
+        "timestamp": now.strftime("%Y-%m-%d %H:%M"),
+        "created_at": now.timestamp(),
+    }
+
+
+def _matches(entry, label, since, until):
+    if label is not None and entry["label"] != label:
+        return False
+    if since is not None and entry["created_at"] < since:
+        return False
+    if until is not None and entry["created_at"] >= until:
+        return False
+    return True
+
+
+class MemoryHistory:
+    """
+    Fixed-size ring buffer; the oldest entry is dropped in O(1).
+    """
+
+    def __init__(self, limit=HISTORY_LIMIT):
+        self._entries = deque(maxlen=limit)
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append({"id": self._next_id, **entry})
+            self._next_id += 1
+
+    def query(self, limit, cursor=None, label=None, since=None, until=None):
+        with self._lock:
+            entries = list(self._entries)
+
+        page = []
+        for entry in reversed(entries):
+            if cursor is not None and entry["id"] >= cursor:
+                continue
+            if _matches(entry, label, since, until):
+                page.append(dict(entry))
+                if len(page) > limit:
+                    break
+
+        return page
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SqliteHistory:
+    """
+    SQLite store in WAL mode, so readers never wait on the writer.
+    add() only enqueues; a writer thread commits queued entries in
+    one transaction every HISTORY_FLUSH_SECONDS and trims the table
+    back to the newest `limit` rows. Entries are counted as they are
+    queued and as they are written, so flush() can wait for exactly
+    the entries queued before it.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text_preview TEXT NOT NULL,
+            label TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            timestamp TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS history_created_at ON history (created_at);
+        CREATE INDEX IF NOT EXISTS history_label_id ON history (label, id);
+    """
+
+    _COLUMNS = ("id", "text_preview", "label", "confidence", "timestamp", "created_at")
+
+    def __init__(self, path=HISTORY_PATH, limit=HISTORY_LIMIT, flush_seconds=HISTORY_FLUSH_SECONDS):
+        self.path = str(path)
+        self.limit = limit
+        self.flush_seconds = flush_seconds
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._wake = threading.Event()
+        self._written_cond = threading.Condition()
+        self._queued = 0
+        self._written = 0
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self._SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections are not shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, entry):
+        # Counted and queued together so the queue order matches the count
+        with self._written_cond:
+            self._queued += 1
+            self._queue.put(entry)
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+
+            # Let a burst of requests pile up into one transaction
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            entries = [e for e in batch if e is not None]
+            try:
+                if entries:
+                    self._write(conn, entries)
+            except sqlite3.Error:
+                # History is best effort; never take the writer down
+                pass
+            finally:
+                with self._written_cond:
+                    self._written += len(entries)
+                    self._written_cond.notify_all()
+
+            if len(entries) < len(batch):
+                return
+
+    def _write(self, conn, entries):
+        with conn:
+            conn.executemany(
+                "INSERT INTO history (text_preview, label, confidence, timestamp, created_at) "
+                "VALUES (:text_preview, :label, :confidence, :timestamp, :created_at)",
+                entries
+            )
+            conn.execute(
+                "DELETE FROM history WHERE id <= (SELECT MAX(id) FROM history) - ?",
+                (self.limit,)
+            )
+
+    def query(self, limit, cursor=None, label=None, since=None, until=None):
+        clauses, params = [], []
+        if cursor is not None:
+            clauses.append("id < ?")
+            params.append(cursor)
+        if label is not None:
+            clauses.append("label = ?")
+            params.append(label)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT {', '.join(self._COLUMNS)} FROM history {where} ORDER BY id DESC LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+
+        return [dict(zip(self._COLUMNS, row)) for row in rows]
+
+    def flush(self):
+        """
+        Blocks until the entries queued before this call are committed.
+        Entries added meanwhile are not waited for, so readers are not
+        held up by a steady stream of writes.
+        """
+        with self._written_cond:
+            target = self._queued
+            if self._written >= target:
+                return
+            self._wake.set()
+            self._written_cond.wait_for(
+                lambda: self._written >= target or not self._writer.is_alive()
+            )
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._wake.set()
+            self._writer.join()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if HISTORY_BACKEND == "memory":
+                    _store = MemoryHistory()
+                elif HISTORY_BACKEND == "sqlite":
+                    _store = SqliteHistory()
+                else:
+                    raise ValueError(f"Unknown history backend: {HISTORY_BACKEND}")
+    return _store
+
+
+def add_history(text, label, confidence):
+    get_store().add(_entry(text, label, confidence))
+
+
+def get_history(limit=50, cursor=None, label=None, since=None, until=None):
+    """
+    Returns (entries, next_cursor); since/until are epoch seconds.
+    """
+    store = get_store()
+
+    # This worker's own recent writes should show up immediately
+    store.flush()
+
+    entries = store.query(limit, cursor, label, since, until)
+    if len(entries) > limit:
+        return entries[:limit], entries[limit - 1]["id"]
+    return entries, None
+
 
-def get_history():
-    return _HISTORY
+def close_history():
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
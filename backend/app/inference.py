@@ -0,0 +1,157 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE
+from app import model
+
+# ==================================================
+# INFERENCE EXECUTOR
+# ==================================================
+# INFERENCE_WORKERS = 0: model calls run in Starlette's threadpool,
+# in this process.
+# INFERENCE_WORKERS > 0: they run in a pool of worker processes,
+# each loading the artifacts once at start-up, so GIL-bound
+# feature extraction and tree traversal scale with cores.
+#
+# Either way at most INFERENCE_QUEUE_SIZE calls are in flight;
+# past that submit() raises InferenceBusy (HTTP 429) instead of
+# letting requests queue without bound.
+
+
+class InferenceBusy(Exception):
+    """All inference slots are taken"""
+
+
+class InferenceUnavailable(Exception):
+    """The worker pool died and is being restarted"""
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_warm_futures = []
+_in_flight = 0
+
+
+def _init_worker():
+    # Runs once in each worker process
+    try:
+        model.warm_up()
+    except Exception:
+        # Reported through worker_status(); calls retry the load
+        pass
+
+
+def _worker_status():
+    try:
+        model.get_context()
+    except Exception:
+        pass
+    return model.load_status()
+
+
+def start():
+    """
+    Starts the worker pool (when enabled) and loads the artifacts in
+    every worker. Returns immediately.
+    """
+    global _pool, _warm_futures
+    if not INFERENCE_WORKERS:
+        return
+
+    with _pool_lock:
+        if _pool is not None:
+            return
+
+        # spawn: workers must not inherit the server's threads and locks
+        _pool = ProcessPoolExecutor(
+            max_workers=INFERENCE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+        _warm_futures = [_pool.submit(_worker_status) for _ in range(INFERENCE_WORKERS)]
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def get_pool():
+    """
+    The worker process pool, or None when inference runs in-process.
+    """
+    if INFERENCE_WORKERS and _pool is None:
+        start()
+    return _pool
+
+
+async def submit(fn, *args):
+    """
+    Runs fn(*args) on the inference executor and awaits the result.
+    fn must be a module-level function of app.model.
+    """
+    global _in_flight
+    if _in_flight >= INFERENCE_QUEUE_SIZE:
+        raise InferenceBusy()
+
+    # Counted on the event loop thread, so no lock is needed
+    _in_flight += 1
+    try:
+        pool = get_pool()
+        if pool is None:
+            return await run_in_threadpool(fn, *args)
+
+        try:
+            return await asyncio.wrap_future(pool.submit(fn, *args))
+        except BrokenProcessPool:
+            # A worker crashed (e.g. OOM); start a fresh pool
+            shutdown()
+            start()
+            raise InferenceUnavailable()
+    finally:
+        _in_flight -= 1
+
+
+def status():
+    """
+    load_status() of this process, or of the workers when the pool
+    is enabled (ready once every worker has loaded).
+    """
+    global _warm_futures
+    if not INFERENCE_WORKERS:
+        out = model.load_status()
+    elif not _warm_futures or not all(f.done() for f in _warm_futures):
+        out = {"ready": False, "version": None, "error": None}
+    else:
+        try:
+            results = [f.result() for f in _warm_futures]
+        except Exception as e:
+            results = [{"ready": False, "version": None, "error": str(e)}]
+        out = {
+            "ready": all(r["ready"] for r in results),
+            "version": results[0]["version"],
+            "error": next((r["error"] for r in results if r["error"]), None),
+        }
+
+        # Poll again (and retry the load) on the next call
+        if not out["ready"] and _pool is not None:
+            try:
+                _warm_futures = [_pool.submit(_worker_status) for _ in range(INFERENCE_WORKERS)]
+            except BrokenProcessPool:
+                shutdown()
+                start()
+
+    out["inference"] = {
+        "workers": INFERENCE_WORKERS,
+        "in_flight": _in_flight,
+        "limit": INFERENCE_QUEUE_SIZE,
+    }
+    return out
@@ -1,18 +1,94 @@
-from fastapi import FastAPI
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app import inference
+from app.concurrency import configure_threadpool
+from app.config import WARMUP, MAX_UPLOAD_BYTES, INFERENCE_WORKERS, METRICS_ENABLED
+from app.metrics import REQUEST_SECONDS
+from app.model import warm_up
+from app.history_store import close_history
 from app.routes import router
 
+
+def _warm_up_quietly():
+    try:
+        warm_up()
+    except Exception:
+        # Reported through /api/health; requests retry the load
+        pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_threadpool()
+
+    # Load models off the event loop so the worker accepts
+    # connections (and health checks) right away. With the process
+    # pool enabled each worker process loads its own copy instead.
+    if INFERENCE_WORKERS:
+        inference.start()
+    elif WARMUP:
+        threading.Thread(target=_warm_up_quietly, name="warm-up", daemon=True).start()
+    yield
+    inference.shutdown()
+    # Commit history entries still queued for the writer
+    close_history()
+
+
 app = FastAPI(
     title="OriginAI Backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Refuse oversized uploads from Content-Length, before the multipart
+# body is read; app/extraction.py still counts the bytes it copies
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    length = request.headers.get("content-length")
+    if (
+        MAX_UPLOAD_BYTES
+        and request.url.path == "/api/predict-file"
+        and length and length.isdigit()
+        and int(length) > MAX_UPLOAD_BYTES + _MULTIPART_OVERHEAD
+    ):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"File too large (max {MAX_UPLOAD_BYTES} bytes)"}
+        )
+    return await call_next(request)
+
+
+if METRICS_ENABLED:
+    @app.middleware("http")
+    async def record_request_latency(request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+
+        # Route template, not the raw path, to keep label cardinality low
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            getattr(route, "path", "unmatched"),
+            response.status_code
+        )
+        return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ✅ DO NOT add prefix here
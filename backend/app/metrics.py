@@ -0,0 +1,219 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+from app.config import METRICS_ENABLED
+
+# ==================================================
+# METRICS (Prometheus text exposition, /metrics)
+# ==================================================
+# Counters, histograms and callback gauges kept in this process,
+# rendered in the Prometheus text format. With METRICS_ENABLED off
+# every observe/inc is skipped and stage() is a shared no-op.
+#
+# With the inference process pool enabled, model stage timers are
+# recorded inside the worker processes and do not show up here;
+# request, batching and queue metrics always do.
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+CHAR_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000, 100000, 1000000)
+
+_NOOP = nullcontext()
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _header(self, kind):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {kind}"]
+
+
+class Counter(_Metric):
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = self._header("counter")
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+
+    def observe(self, value, *labels):
+        if not METRICS_ENABLED:
+            return
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self):
+        lines = self._header("histogram")
+        with self._lock:
+            items = sorted((k, [list(v[0]), v[1], v[2]]) for k, v in self._values.items())
+
+        for labels, (counts, total, n) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = _labels(self.labelnames + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {n}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Read from a callback at scrape time, so there is nothing to
+    update on the request path. The callback returns a number or a
+    {label tuple: number} dict. kind="counter" exposes a running
+    total kept elsewhere (e.g. ResultCache.hits).
+    """
+
+    def __init__(self, name, help_text, callback, labelnames=(), kind="gauge"):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+        self.kind = kind
+
+    def render(self):
+        lines = self._header(self.kind)
+        value = self.callback()
+        values = value if isinstance(value, dict) else {(): value}
+        for labels, v in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {v}")
+        return lines
+
+
+REGISTRY = []
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        try:
+            lines.extend(metric.render())
+        except Exception:
+            # A failing gauge callback must not break the scrape
+            continue
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------
+# Pipeline metrics
+# ----------------------------------------------
+
+STAGE_SECONDS = Histogram(
+    "originai_stage_seconds",
+    "Time spent in each prediction stage, per call (one call may cover a batch).",
+    ("stage",)
+)
+
+REQUEST_SECONDS = Histogram(
+    "originai_request_seconds",
+    "HTTP request latency by route.",
+    ("route", "status")
+)
+
+REQUEST_TEXTS = Histogram(
+    "originai_request_texts",
+    "Texts per prediction request.",
+    ("route",),
+    buckets=SIZE_BUCKETS
+)
+
+REQUEST_CHARS = Histogram(
+    "originai_request_chars",
+    "Characters per submitted text.",
+    ("route",),
+    buckets=CHAR_BUCKETS
+)
+
+BATCH_SIZE = Histogram(
+    "originai_batch_size",
+    "Texts per micro-batch sent to the inference executor.",
+    buckets=SIZE_BUCKETS
+)
+
+BATCH_WAIT_SECONDS = Histogram(
+    "originai_batch_wait_seconds",
+    "Time a /api/predict call waited for its micro-batch to be dispatched."
+)
+
+CASCADE_TEXTS = Counter(
+    "originai_cascade_texts_total",
+    "Texts answered by each confidence-cascade tier (fast = first-tier trees only).",
+    ("tier",)
+)
+
+REJECTED = Counter(
+    "originai_rejected_total",
+    "Requests refused with 429 because the inference queue was full."
+)
+
+
+@contextmanager
+def _timed(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage)
+
+
+def stage(name):
+    """
+    Context manager timing one pipeline stage into
+    originai_stage_seconds{stage=name}.
+    """
+    if not METRICS_ENABLED:
+        return _NOOP
+    return _timed(name)
+
+
+def observe_stages(seconds_by_stage):
+    """
+    Records stage durations measured elsewhere (e.g. summed over a
+    batch by StylometricExtractor.analyze_batch).
+    """
+    for name, seconds in seconds_by_stage.items():
+        STAGE_SECONDS.observe(seconds, name)
@@ -1,9 +1,10 @@
 import sys
+import copy
+import threading
 import numpy as np
 import joblib
 from pathlib import Path
 from scipy.sparse import hstack, csr_matrix
-import shap
 
 # ==================================================
 # PATH SETUP
@@ -13,95 +14,452 @@ BACKEND_DIR = Path(__file__).resolve().parent.parent
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from ml_model.src.features.stylometric import StylometricExtractor
+from ml_model.src.features.stylometric import StylometricExtractor, SentenceStats
+from ml_model.src.features.pos import get_pos_tagger
+from ml_model.src.resources import ensure_nltk_resources
+from app.config import (
+    EXPLAIN_MODE, TOP_K_TOKENS, CACHE_SIZE, CACHE_TTL, POS_BACKEND, NLTK_DOWNLOAD,
+    USE_SHARED_ARTIFACTS, FOREST_ENGINE, FLAT_MAX_ROWS, LONG_TEXT_WORDS, SEGMENT_WORDS, MIN_SEGMENT_WORDS,
+    METRICS_ENABLED, CASCADE_TREES, CASCADE_MIN_CONFIDENCE, CASCADE_MIN_MARGIN
+)
+from app.cache import ResultCache, text_key
+from app.metrics import stage, observe_stages, CASCADE_TEXTS
+from app.forest import FlatForest
+from app.tfidf import CompactTfidf
+from app.analysis import analyze_documents
+from app.concurrency import limit_threads, configure_estimator
+from app.segmentation import segment_text
+from app.artifacts import MODEL_DIR, artifact_version, bundle_is_current, load_bundle
+
+result_cache = ResultCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+
+# ==================================================
+# MODEL CONTEXT (built once at load)
+# ==================================================
+
+class ModelContext:
+    """
+    Holds everything derived from the loaded artifacts that
+    would otherwise be rebuilt on every request.
+    """
+
+    def __init__(
+        self, tfidf, label_encoder, stylometric_extractor, version="",
+        model=None, forest=None, model_path=None, explain_mode="shap"
+    ):
+        # Classification runs on the FlatForest engine (memory-mapped
+        # when the shared bundle is deployed) or on the sklearn model,
+        # per FOREST_ENGINE and batch size (engine()). Without a model
+        # object the sklearn pickle is only unpickled (from model_path)
+        # if full SHAP or FOREST_ENGINE="sklearn" needs it.
+        self.version = version
+        self.explain_mode = explain_mode
+        self._forest = forest
+        self.tfidf = tfidf
+        self.label_encoder = label_encoder
+        self.stylometric_extractor = stylometric_extractor
+        self._model = model
+        self._model_path = model_path
+
+        self.feature_names = tfidf.get_feature_names_out()
+        self.tfidf_len = len(self.feature_names)
+        self.n_features = forest.n_features if forest is not None else int(model.n_features_in_)
+
+        # Columns whose tokens are worth showing (ranked only in
+        # sparse mode; full SHAP filters after ranking).
+        self.token_mask = np.array(
+            [len(t) >= 3 and not t.isdigit() for t in self.feature_names],
+            dtype=bool
+        )
+
+        # Dense float32 row handed to SHAP. One buffer per thread
+        # because FastAPI serves sync routes from a threadpool.
+        self._local = threading.local()
+
+        self._lock = threading.RLock()
+        self._explainer = None
+        self._tiers = {}
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = configure_estimator(joblib.load(self._model_path))
+        return self._model
+
+    @property
+    def forest(self):
+        if self._forest is None:
+            with self._lock:
+                if self._forest is None:
+                    self._forest = FlatForest.from_sklearn(self.model)
+        return self._forest
+
+    def engine(self, n_rows):
+        """
+        "flat" or "sklearn" for a forest call over n_rows rows.
+        """
+        if FOREST_ENGINE != "auto":
+            return FOREST_ENGINE
+        # Never unpickles the model just for this, so bundle workers
+        # keep to the memory-mapped forest
+        if self._model is not None and n_rows >= FLAT_MAX_ROWS:
+            return "sklearn"
+        return "flat"
+
+    def predict_proba(self, X):
+        with stage("forest"):
+            if self.engine(X.shape[0]) == "sklearn":
+                return self.model.predict_proba(X)
+            return self.forest.predict_proba(X)
+
+    # ----------------------------------------------
+    # Confidence cascade
+    # ----------------------------------------------
+
+    @property
+    def n_trees(self):
+        if self._forest is not None:
+            return self._forest.n_trees
+        return len(self.model.estimators_)
+
+    @property
+    def cascade_enabled(self):
+        return 0 < CASCADE_TREES < self.n_trees
+
+    def tiers(self, engine):
+        """
+        (first CASCADE_TREES trees, remaining trees) on the given
+        engine: views of the flat forest, or shallow copies of the
+        sklearn model holding a slice of its estimators. Both engines
+        cascade the same way, so a text gets the same answer whether
+        it is scored alone or in a batch.
+        """
+        if engine not in self._tiers:
+            with self._lock:
+                if engine == "sklearn":
+                    model = self.model
+                    n = len(model.estimators_)
+                    tiers = (_sklearn_subset(model, 0, CASCADE_TREES), _sklearn_subset(model, CASCADE_TREES, n))
+                else:
+                    forest = self.forest
+                    tiers = (forest.subset(0, CASCADE_TREES), forest.subset(CASCADE_TREES, forest.n_trees))
+                self._tiers[engine] = tiers
+        return self._tiers[engine]
+
+    def cascade_proba(self, X, settled=None, count=True):
+        """
+        predict_proba in two tiers. Every row goes through the first
+        tier; rows it scores confidently (_is_confident), or that
+        `settled` marks as decided anyway, stop there. The others run
+        the remaining trees, averaged in so that their probabilities
+        are the full forest's.
+
+        Returns (proba, early), early marking rows answered by the
+        first tier alone. count=False leaves the CASCADE_TEXTS metric
+        alone, for rescoring a text already counted.
+        """
+        if not self.cascade_enabled:
+            return self.predict_proba(X), np.zeros(X.shape[0], dtype=bool)
+
+        fast, rest = self.tiers(self.engine(X.shape[0]))
+        with stage("forest_fast"):
+            proba = fast.predict_proba(X)
+
+        early = _is_confident(proba)
+        if settled is not None:
+            early |= settled
+
+        escalate = np.flatnonzero(~early)
+        if escalate.size:
+            k, n = CASCADE_TREES, self.n_trees
+            with stage("forest"):
+                proba[escalate] = (k * proba[escalate] + (n - k) * rest.predict_proba(X[escalate])) / n
+
+        if count:
+            CASCADE_TEXTS.inc("fast", amount=int(early.sum()))
+            CASCADE_TEXTS.inc("full", amount=int(escalate.size))
+        return proba, early
+
+    @property
+    def explainer(self):
+        # shap is heavy to import and TreeExplainer walks every tree,
+        # so both wait until the first full-SHAP explanation.
+        if self._explainer is None:
+            with self._lock:
+                if self._explainer is None:
+                    import shap
+                    self._explainer = shap.TreeExplainer(self.model)
+        return self._explainer
+
+    def dense_row(self, X_row):
+        """
+        Scatters a 1-row CSR matrix into the reusable float32 buffer.
+        """
+        buf = getattr(self._local, "row_buffer", None)
+        if buf is None:
+            buf = np.zeros((1, self.n_features), dtype=np.float32)
+            self._local.row_buffer = buf
+        else:
+            buf.fill(0.0)
+
+        buf[0, X_row.indices] = X_row.data
+        return buf
+
+    def path_contributions(self, X_row, class_idx, fast=False):
+        """
+        Per-feature contribution to the class probability, summed over
+        the split nodes each tree visits for this row. fast=True
+        attributes over the first cascade tier only, matching a row
+        that exited early.
+        """
+        forest = self.tiers("flat")[0] if fast else self.forest
+        return forest.path_contributions(X_row, class_idx)
+
+
+def _sklearn_subset(model, start, stop):
+    """
+    The fitted forest restricted to estimators [start, stop); its
+    predict_proba averages over those trees only.
+    """
+    subset = copy.copy(model)
+    subset.estimators_ = model.estimators_[start:stop]
+    subset.n_estimators = len(subset.estimators_)
+    return subset
+
 
 # ==================================================
 # LOAD ARTIFACTS
 # ==================================================
 
-MODEL_DIR = BACKEND_DIR / "models"
+def load_context(model_dir=MODEL_DIR):
+    limit_threads()
+    stylometric_extractor = StylometricExtractor(
+        pos_tagger=get_pos_tagger(POS_BACKEND, model_dir / "pos_lexicon.json")
+    )
+    model_path = model_dir / "text_origin_model.pkl"
+    bundle_dir = model_dir / "shared"
+
+    # Shared memory-mapped bundle (python -m app.artifacts export)
+    if USE_SHARED_ARTIFACTS and bundle_is_current(bundle_dir=bundle_dir, model_dir=model_dir):
+        explain_mode = "sparse" if EXPLAIN_MODE == "auto" else EXPLAIN_MODE
+
+        # The bundle has no sklearn forest for TreeSHAP to walk
+        if explain_mode == "shap" and not model_path.exists():
+            raise FileNotFoundError(
+                f"ORIGINAI_EXPLAIN_MODE=shap needs {model_path}; "
+                "use sparse or auto with a bundle-only deploy"
+            )
+
+        version, forest, tfidf, label_encoder = load_bundle(bundle_dir)
+        return ModelContext(
+            tfidf, label_encoder, stylometric_extractor,
+            version=version, forest=forest, model_path=model_path,
+            explain_mode=explain_mode
+        )
 
-model = joblib.load(MODEL_DIR / "text_origin_model.pkl")
-tfidf = joblib.load(MODEL_DIR / "tfidf_vectorizer.pkl")
-label_encoder = joblib.load(MODEL_DIR / "label_encoder.pkl")
+    # The pickled vectorizer is only kept long enough to copy out
+    # what transform() needs
+    model = configure_estimator(joblib.load(model_path))
+    return ModelContext(
+        CompactTfidf.from_sklearn(joblib.load(model_dir / "tfidf_vectorizer.pkl")),
+        joblib.load(model_dir / "label_encoder.pkl"),
+        stylometric_extractor,
+        version=artifact_version(model_dir),
+        model=model,
+        forest=FlatForest.from_sklearn(model) if FOREST_ENGINE != "sklearn" else None,
+        explain_mode="shap" if EXPLAIN_MODE == "auto" else EXPLAIN_MODE
+    )
+
+# Nothing is loaded at import time. The first prediction (or
+# warm_up() from the app's startup hook) builds the context.
+
+_context = None
+_context_lock = threading.Lock()
+_load_error = None
+
+
+def get_context():
+    global _context, _load_error
+
+    if _context is None:
+        with _context_lock:
+            if _context is None:
+                try:
+                    ensure_nltk_resources(download=NLTK_DOWNLOAD)
+                    _context = load_context()
+                    _load_error = None
+                except Exception as e:
+                    _load_error = f"{type(e).__name__}: {e}"
+                    raise
+    return _context
+
+
+def warm_up():
+    """
+    Loads artifacts and runs one prediction so the first real
+    request does not pay for lazy initialisation.
+    """
+    ctx = get_context()
+    if ctx.explain_mode != "sparse":
+        ctx.explainer
+    predict_texts(["warm up " * 12], explain=False)
+
+
+def load_status():
+    return {
+        "ready": _context is not None,
+        "version": _context.version if _context is not None else None,
+        "error": _load_error,
+    }
 
-stylometric_extractor = StylometricExtractor()
-explainer = shap.TreeExplainer(model)
 
-# MAIN FUNCTION
+def reload_artifacts():
+    """
+    Reloads the pickles from MODEL_DIR and returns the new version.
+    """
+    global _context
+    context = load_context()
+    with _context_lock:
+        _context = context
+    return context.version
 
-def predict_text(text: str):
-   
-    if not text or not text.strip():
-        return {
-            "label": "Human",
-            "confidence": 0.0,
-            "shap": [],
-            "stylometry": {}
-        }
+# ==================================================
+# INTERNAL HELPERS
+# ==================================================
 
-    # Feature extraction
-    X_tfidf = tfidf.transform([text])
+def _empty_result():
+    return {
+        "label": "Human",
+        "confidence": 0.0,
+        "shap": [],
+        "stylometry": {}
+    }
 
-    style_features = stylometric_extractor.extract_features(text)
-    X_style = csr_matrix([list(style_features.values())])
 
-    X = hstack([X_tfidf, X_style])
+def _build_features(ctx, texts):
+    """
+    Builds the combined TF-IDF + stylometric matrix for a batch
+    from one tokenization pass per text (app/analysis.py) and one
+    sparse hstack.
+
+    Also returns the stylometric columns (float64, for the
+    "stylometry" response) and each text's SentenceStats, reused by
+    the LLM-Rewritten check.
+    """
+    with stage("analyze"):
+        docs = analyze_documents(ctx.tfidf, texts)
+
+    with stage("tfidf"):
+        X_tfidf = ctx.tfidf.matrix([d.term_counts for d in docs])
+
+    # POS / readability are summed over the batch and recorded as
+    # stylometry_* stages
+    timings = {} if METRICS_ENABLED else None
+    with stage("stylometry"):
+        X_style, sentence_stats = ctx.stylometric_extractor.analyze_batch(
+            texts, timings, tokens=[d.tokens for d in docs]
+        )
+    if timings:
+        observe_stages({f"stylometry_{k}": v for k, v in timings.items()})
 
-    # Prediction
-    proba = model.predict_proba(X)[0]
-    pred_idx = int(np.argmax(proba))
-    confidence = float(proba[pred_idx])
-    label = label_encoder.inverse_transform([pred_idx])[0]
-
-    # Short human text safety
-    if len(text.split()) < 12:
-        return {
-            "label": "Human",
-            "confidence": round(confidence, 4),
-            "shap": [],
-            "stylometry": {
-                k: round(float(v), 4) for k, v in style_features.items()
-            }
-        }
+    # The forest reads features as float32, as extract_batch returns them
+    with stage("hstack"):
+        X = hstack([X_tfidf, csr_matrix(X_style.astype(np.float32), dtype=np.float64)], format="csr")
+    return X, X_style, sentence_stats
 
-    # SHAP (REAL)
+
+def _class_shap(shap_values, pred_idx):
+    # Older shap returns one array per class, newer releases a
+    # single (rows, features, classes) array.
+    if isinstance(shap_values, list):
+        return shap_values[min(pred_idx, len(shap_values) - 1)][0]
+    if shap_values.ndim == 3:
+        return shap_values[0, :, min(pred_idx, shap_values.shape[2] - 1)]
+    return shap_values[0]
+
+
+def _shap_tokens(ctx, X_row, pred_idx):
+    """
+    Full TreeSHAP over every feature column.
+    """
     shap_explanation = []
 
-    try:
-        X_dense = X.toarray().astype(np.float32)
+    X_dense = ctx.dense_row(X_row)
 
-        shap_values = explainer.shap_values(
-            X_dense,
-            check_additivity=False
-        )
+    shap_values = ctx.explainer.shap_values(
+        X_dense,
+        check_additivity=False
+    )
 
-        if isinstance(shap_values, list):
-            class_shap = shap_values[min(pred_idx, len(shap_values) - 1)][0]
-        else:
-            class_shap = shap_values[0]
+    class_shap = _class_shap(shap_values, pred_idx)
+
+    tfidf_features = ctx.feature_names
+    tfidf_len = ctx.tfidf_len
+
+    tfidf_shap = class_shap[:tfidf_len]
+    top_idx = np.argsort(np.abs(tfidf_shap))[-TOP_K_TOKENS:][::-1]
+
+    for i in top_idx:
+        token = tfidf_features[i]
+
+        impact_raw = tfidf_shap[i]
+        impact = float(np.asarray(impact_raw).reshape(-1)[0])
+
+        if abs(impact) < 1e-6:
+            continue
+        if len(token) < 3 or token.isdigit():
+            continue
+
+        shap_explanation.append({
+            "token": token,
+            "impact": round(impact, 4)
+        })
+
+    return shap_explanation
 
-        tfidf_features = tfidf.get_feature_names_out()
-        tfidf_len = len(tfidf_features)
 
-        tfidf_shap = class_shap[:tfidf_len]
-        top_idx = np.argsort(np.abs(tfidf_shap))[-10:][::-1]
+def _sparse_tokens(ctx, X_row, pred_idx, fast=False):
+    """
+    Attribution restricted to the document's own nonzero TF-IDF
+    terms, using per-node contributions along the decision paths.
+    """
+    cols = X_row.indices[X_row.indices < ctx.tfidf_len]
+    cols = cols[ctx.token_mask[cols]]
+    if cols.size == 0:
+        return []
 
-        for i in top_idx:
-            token = tfidf_features[i]
+    contrib = ctx.path_contributions(X_row, pred_idx, fast=fast)
+    impacts = contrib[cols]
 
-            impact_raw = tfidf_shap[i]
-            impact = float(np.asarray(impact_raw).reshape(-1)[0])
+    keep = np.abs(impacts) >= 1e-6
+    cols, impacts = cols[keep], impacts[keep]
 
-            if abs(impact) < 1e-6:
-                continue
-            if len(token) < 3 or token.isdigit():
-                continue
+    if cols.size > TOP_K_TOKENS:
+        top = np.argpartition(np.abs(impacts), -TOP_K_TOKENS)[-TOP_K_TOKENS:]
+        cols, impacts = cols[top], impacts[top]
 
-            shap_explanation.append({
-                "token": token,
-                "impact": round(impact, 4)
-            })
+    order = np.argsort(-np.abs(impacts))
+
+    return [
+        {
+            "token": ctx.feature_names[cols[i]],
+            "impact": round(float(impacts[i]), 4)
+        }
+        for i in order
+    ]
+
+
+def _explain(ctx, X_row, pred_idx, fast=False):
+    # fast: the row exited the cascade early; sparse attribution then
+    # follows the same first-tier trees that produced its label
+    try:
+        with stage("explain"):
+            if ctx.explain_mode == "sparse":
+                shap_explanation = _sparse_tokens(ctx, X_row, pred_idx, fast)
+            else:
+                shap_explanation = _shap_tokens(ctx, X_row, pred_idx)
 
     except Exception:
         shap_explanation = []
@@ -118,34 +476,258 @@ def predict_text(text: str):
             {"token": "conclusion", "impact": 0.06}
         ]
 
+    return shap_explanation
+
+
+def _is_llm_rewritten(sentence_stats):
+    with stage("rewrite"):
+        return _mixed_sentences(sentence_stats)
+
+
+def _mixed_sentences(sentence_stats):
     # LLM-REWRITTEN = MIX OF HUMAN + AI SENTENCES
-    sentences = [s.strip() for s in text.replace("!", ".").replace("?", ".").split(".") if len(s.strip()) > 5]
+    # Runs on the punkt sentences already split for stylometry
+    # (ml_model/src/features/stylometric.py: SentenceStats)
+    wc = sentence_stats.words
+    avg_word_len = sentence_stats.word_length
+    kept = sentence_stats.chars > 5
+
+    # Human-like
+    human_like = kept & (wc < 12) & (avg_word_len < 4.6)
+
+    # AI-like
+    ai_like = kept & (wc > 15) & (avg_word_len > 4.8)
+
+    return bool(human_like.any() and ai_like.any())
+
+# ==================================================
+# MAIN FUNCTIONS
+# ==================================================
+
+def _is_short(text):
+    return len(text.split()) < 12
+
+
+def _is_confident(proba):
+    """
+    Rows whose top class clears CASCADE_MIN_CONFIDENCE and leads the
+    runner-up by at least CASCADE_MIN_MARGIN (the uncertainty rule of
+    the earlier hybrid model).
+    """
+    top2 = np.sort(proba, axis=1)[:, -2:]
+    return (top2[:, 1] >= CASCADE_MIN_CONFIDENCE) & (top2[:, 1] - top2[:, 0] >= CASCADE_MIN_MARGIN)
+
+
+def predict_texts(texts, explain=True):
+    """
+    Predicts a batch of texts with one TF-IDF transform, one
+    stylometric matrix and one cascaded forest call: texts the first
+    tier of trees is sure about (and short texts, whose label is
+    fixed) skip the remaining trees.
+
+    With explain=False the SHAP step is skipped and "shap" is empty.
+    Returns one result dict per input, in input order.
+    """
+    results = [_empty_result() for _ in texts]
+    ctx = get_context()
+
+    # Cache lookup; repeated texts inside the batch are scored once
+    version = ctx.version
+    pending = {}
+
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+
+        key = text_key(text, version, explain)
+        if key in pending:
+            pending[key].append(i)
+            continue
+
+        cached = result_cache.get(key)
+        if cached is not None:
+            results[i] = dict(cached)
+        else:
+            pending[key] = [i]
+
+    if not pending:
+        return results
+
+    keys = list(pending)
+    live_texts = [texts[pending[k][0]] for k in keys]
+
+    # Feature extraction
+    X, X_style, sentence_stats = _build_features(ctx, live_texts)
+
+    # Prediction
+    short = np.fromiter((_is_short(t) for t in live_texts), dtype=bool, count=len(live_texts))
+    proba, early = ctx.cascade_proba(X, settled=short)
+    pred_idx = np.argmax(proba, axis=1)
+    labels = ctx.label_encoder.inverse_transform(pred_idx)
+
+    for row, key in enumerate(keys):
+        confidence = float(proba[row, pred_idx[row]])
+        stylometry = {
+            k: round(float(v), 4)
+            for k, v in zip(ctx.stylometric_extractor.feature_names, X_style[row])
+        }
+
+        # Short human text safety
+        if short[row]:
+            result = {
+                "label": "Human",
+                "confidence": round(confidence, 4),
+                "shap": [],
+                "stylometry": stylometry
+            }
+        else:
+            label = str(labels[row])
+            if _is_llm_rewritten(sentence_stats[row]):
+                label = "LLM-Rewritten"
+
+            result = {
+                "label": label,
+                "confidence": round(confidence, 4),
+                "shap": _explain(ctx, X[row], int(pred_idx[row]), early[row]) if explain else [],
+                "stylometry": stylometry
+            }
+
+        result_cache.put(key, result)
+        for i in pending[key]:
+            results[i] = dict(result)
+
+    return results
+
+
+def predict_text(text: str, explain=True):
+    return predict_texts([text], explain=explain)[0]
 
-    human_like = 0
-    ai_like = 0
 
-    for s in sentences:
-        words = s.split()
-        wc = len(words)
-        avg_word_len = sum(len(w) for w in words) / max(len(words), 1)
+def explain_text(text: str, segmented=False):
+    """
+    Token explanation for a single text, as returned in "shap" by
+    predict_text, or by predict_document with segmented=True. Used to
+    compute explanations off the request path.
+    """
+    if not text or not text.strip() or _is_short(text):
+        return []
 
-        # Human-like
-        if wc < 12 and avg_word_len < 4.6:
-            human_like += 1
+    ctx = get_context()
 
-        # AI-like
-        if wc > 15 and avg_word_len > 4.8:
-            ai_like += 1
+    if segmented and _is_long(text):
+        X, _, _, proba, segments = _score_segments(ctx, text)
+        doc_idx = int(np.argmax(_average_proba(proba, segments)))
+        row = int(np.argmax(proba[:, doc_idx]))
+        return _explain(ctx, X[row], doc_idx)
+
+    # The prediction that returned this text's label already counted it
+    X, _, _ = _build_features(ctx, [text])
+    proba, early = ctx.cascade_proba(X, count=False)
+    pred_idx = int(np.argmax(proba[0]))
+
+    return _explain(ctx, X[0], pred_idx, early[0])
+
+
+# ==================================================
+# LONG DOCUMENTS
+# ==================================================
+# Documents of LONG_TEXT_WORDS words or more are split into
+# sentence-aligned segments of about SEGMENT_WORDS words
+# (app/segmentation.py). All segments go through one
+# _build_features / predict_proba batch, so cost grows linearly
+# with length, and every segment is independent of the others.
 
-    if human_like > 0 and ai_like > 0:
+# Stylometric columns that are totals, summed across segments;
+# the rest are word-weighted averages
+_SUMMED_STYLOMETRY = ("word_count", "sentence_count", "char_count")
+
+
+def _is_long(text):
+    return len(text.split()) >= LONG_TEXT_WORDS
+
+
+def _score_segments(ctx, text):
+    segments = segment_text(text, SEGMENT_WORDS, MIN_SEGMENT_WORDS)
+    X, X_style, sentence_stats = _build_features(ctx, [text[a:b] for a, b, _ in segments])
+    return X, X_style, sentence_stats, ctx.predict_proba(X), segments
+
+
+def _average_proba(proba, segments):
+    weights = np.array([n for _, _, n in segments], dtype=np.float64)
+    return weights @ proba / weights.sum()
+
+
+def predict_long_text(text: str, explain=True):
+    """
+    Scores a long document segment by segment and averages the
+    class probabilities, weighted by segment word count.
+
+    The result has the predict_text fields plus "segments": label,
+    confidence, word count and [start, end) character offsets of
+    each segment. Tokens are explained on the segment that most
+    strongly supports the document label.
+    """
+    if not text or not text.strip():
+        return _empty_result()
+
+    ctx = get_context()
+    key = text_key(text, ctx.version, explain, "long")
+    cached = result_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    X, X_style, sentence_stats, proba, segments = _score_segments(ctx, text)
+    names = ctx.stylometric_extractor.feature_names
+
+    seg_idx = np.argmax(proba, axis=1)
+    seg_labels = ctx.label_encoder.inverse_transform(seg_idx)
+
+    doc_proba = _average_proba(proba, segments)
+    doc_idx = int(np.argmax(doc_proba))
+
+    label = str(ctx.label_encoder.inverse_transform([doc_idx])[0])
+    if _is_llm_rewritten(SentenceStats.concat(sentence_stats)):
         label = "LLM-Rewritten"
 
-    # Final response
-    return {
+    weights = np.array([n for _, _, n in segments], dtype=np.float64)
+    style_mean = weights @ X_style / weights.sum()
+    style_sum = X_style.sum(axis=0, dtype=np.float64)
+    stylometry = {
+        k: round(float(style_sum[j] if k in _SUMMED_STYLOMETRY else style_mean[j]), 4)
+        for j, k in enumerate(names)
+    }
+
+    shap_tokens = []
+    if explain:
+        row = int(np.argmax(proba[:, doc_idx]))
+        shap_tokens = _explain(ctx, X[row], doc_idx)
+
+    result = {
         "label": label,
-        "confidence": round(confidence, 4),
-        "shap": shap_explanation,
-        "stylometry": {
-            k: round(float(v), 4) for k, v in style_features.items()
-        }
+        "confidence": round(float(doc_proba[doc_idx]), 4),
+        "shap": shap_tokens,
+        "stylometry": stylometry,
+        "segments": [
+            {
+                "start": int(a),
+                "end": int(b),
+                "words": int(n),
+                "label": str(seg_labels[i]),
+                "confidence": round(float(proba[i, seg_idx[i]]), 4)
+            }
+            for i, (a, b, n) in enumerate(segments)
+        ]
     }
+
+    result_cache.put(key, result)
+    return dict(result)
+
+
+def predict_document(text: str, explain=True):
+    """
+    predict_text for ordinary inputs, predict_long_text once the
+    document reaches LONG_TEXT_WORDS words.
+    """
+    if text and _is_long(text):
+        return predict_long_text(text, explain=explain)
+    return predict_text(text, explain=explain)
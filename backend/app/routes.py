@@ -1,30 +1,179 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.model import predict_text
-from app.schemas import TextRequest
-from app.history_store import get_history, add_history
+from datetime import datetime
+from typing import Literal, Optional
 
-from PyPDF2 import PdfReader
-import docx
+from fastapi import APIRouter, UploadFile, File, HTTPException, Response, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app import concurrency, inference, metrics
+from app.batching import batcher, predict_one
+from app.config import (
+    MAX_BATCH_SIZE, HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE, METRICS_ENABLED, EXPLAIN_QUEUE_SIZE
+)
+from app.model import predict_texts, predict_document, result_cache
+from app.schemas import TextRequest, BatchTextRequest
+from app.history_store import get_history, add_history
+from app.explanations import (
+    reserve_explanations, release_explanations, submit_explanations, get_explanation
+)
+from app.extraction import extract_upload, ExtractionError
 
 router = APIRouter(prefix="/api", tags=["Prediction"])
 
+# explain=true  -> SHAP tokens computed inline (default)
+# explain=false -> label only, SHAP skipped
+# explain=async -> label now, tokens later from /api/explain/{id}
+ExplainMode = Literal["false", "true", "async"]
+
+
+async def _infer(fn, *args):
+    # Model calls go through the inference executor (app/inference.py)
+    return await _backpressure(inference.submit(fn, *args))
+
+
+async def _backpressure(call):
+    try:
+        return await call
+    except inference.InferenceBusy:
+        metrics.REJECTED.inc()
+        raise HTTPException(
+            status_code=429,
+            detail="Server busy, retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    except inference.InferenceUnavailable:
+        raise HTTPException(
+            status_code=503,
+            detail="Inference workers restarting, retry shortly",
+            headers={"Retry-After": "5"}
+        )
+
+
+async def _run_prediction(texts, explain, score, segmented=False):
+    """
+    Awaits score(), which returns one result per text. For
+    explain=async a job slot per non-empty text is claimed before
+    scoring starts, and the jobs are queued once it has finished.
+    segmented: score() uses predict_document.
+    """
+    rows = _reserve_explanations(texts, explain)
+    try:
+        results = await score()
+    except BaseException:
+        release_explanations(len(rows))
+        raise
+
+    if rows:
+        ids = await run_in_threadpool(submit_explanations, [texts[i] for i in rows], segmented)
+        for i, job_id in zip(rows, ids):
+            results[i]["explanation_id"] = job_id
+
+    return results
+
+
+def _reserve_explanations(texts, explain):
+    """
+    For explain=async: claims a job slot per non-empty text before
+    any inference runs and returns their indices ([] otherwise).
+    """
+    if explain != "async":
+        return []
+
+    rows = [i for i, text in enumerate(texts) if text and text.strip()]
+    if len(rows) > EXPLAIN_QUEUE_SIZE:
+        # Would never fit, so retrying cannot help
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many texts for explain=async (max {EXPLAIN_QUEUE_SIZE})"
+        )
+
+    try:
+        reserve_explanations(len(rows))
+    except inference.InferenceBusy:
+        metrics.REJECTED.inc()
+        raise HTTPException(
+            status_code=429,
+            detail="Too many pending explanations, retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    return rows
+
 # HEALTH CHECK
+# Always 200 while the process is up; "ready" turns true once
+# the model artifacts are loaded. /ready mirrors it as 200/503
+# for load balancer readiness probes.
 
 @router.get("/health")
 def health():
-    return {"status": "ok"}
+    status = inference.status()
+    return {
+        "status": "ok" if status["ready"] else "loading",
+        "ready": status["ready"],
+        "model_version": status["version"],
+        "error": status["error"],
+        "cache": result_cache.stats(),
+        "inference": status["inference"],
+        "batching": batcher.stats(),
+        "concurrency": concurrency.plan()
+    }
+
+
+@router.get("/ready")
+def ready(response: Response):
+    status = inference.status()
+    if not status["ready"]:
+        response.status_code = 503
+    return {"ready": status["ready"]}
+
+# METRICS
+# Prometheus text format; 404 when ORIGINAI_METRICS is off.
+
+metrics.Gauge(
+    "originai_cache_entries", "Entries in the prediction result cache.",
+    lambda: result_cache.stats()["size"]
+)
+metrics.Gauge(
+    "originai_cache_lookups_total", "Result cache lookups since start, by outcome.",
+    lambda: {("hit",): result_cache.hits, ("miss",): result_cache.misses},
+    ("outcome",),
+    kind="counter"
+)
+metrics.Gauge(
+    "originai_inference_in_flight", "Model calls running or queued on the inference executor.",
+    lambda: inference.status()["inference"]["in_flight"]
+)
+metrics.Gauge(
+    "originai_batch_queue_depth", "/api/predict calls waiting for a micro-batch.",
+    lambda: batcher.queue_depth
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(
+            status_code=404,
+            detail="Metrics are disabled"
+        )
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 # TEXT PREDICTION (PRIMARY FLOW)
 
 @router.post("/predict")
-def predict(request: TextRequest):
+async def predict(request: TextRequest, explain: ExplainMode = "true"):
     if not request.text or not request.text.strip():
         raise HTTPException(
             status_code=400,
             detail="Text is empty"
         )
 
-    result = predict_text(request.text)
+    metrics.REQUEST_TEXTS.observe(1, "predict")
+    metrics.REQUEST_CHARS.observe(len(request.text), "predict")
+
+    # Concurrent requests are scored together (app/batching.py)
+    async def score():
+        return [await _backpressure(predict_one(request.text, explain == "true"))]
+
+    result = (await _run_prediction([request.text], explain, score))[0]
 
     # Ensure keys exist
     result.setdefault("shap", [])
@@ -40,34 +189,63 @@ def predict(request: TextRequest):
     return result
 
 
+# BATCH TEXT PREDICTION
+# One vectorized pass over the whole batch instead of
+# one predict_text call per document.
+
+@router.post("/predict-batch")
+async def predict_batch(request: BatchTextRequest, explain: ExplainMode = "true"):
+    if not request.texts:
+        raise HTTPException(
+            status_code=400,
+            detail="No texts provided"
+        )
+
+    if len(request.texts) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {MAX_BATCH_SIZE} texts)"
+        )
+
+    metrics.REQUEST_TEXTS.observe(len(request.texts), "predict-batch")
+    for text in request.texts:
+        metrics.REQUEST_CHARS.observe(len(text or ""), "predict-batch")
+
+    results = await _run_prediction(
+        request.texts, explain,
+        lambda: _infer(predict_texts, request.texts, explain == "true")
+    )
+
+    for text, result in zip(request.texts, results):
+        if text and text.strip():
+            add_history(
+                text,
+                result["label"],
+                result["confidence"]
+            )
+
+    return {"results": results}
+
+
 # FILE PREDICTION 
 # NOTE:
 # This endpoint is intentionally kept even though
 # the frontend upload UI is removed.
 # It demonstrates extensibility of the system.
+# Extraction runs in the threadpool and prediction on the
+# inference executor, never on the event loop.
 
 @router.post("/predict-file")
-async def predict_file(file: UploadFile = File(...)):
-    filename = file.filename.lower()
-    text = ""
-
-    if filename.endswith(".txt"):
-        content = await file.read()
-        text = content.decode("utf-8", errors="ignore")
-
-    elif filename.endswith(".pdf"):
-        reader = PdfReader(file.file)
-        pages = [p.extract_text() for p in reader.pages if p.extract_text()]
-        text = " ".join(pages)
-
-    elif filename.endswith(".docx"):
-        doc = docx.Document(file.file)
-        text = " ".join(p.text for p in doc.paragraphs if p.text)
-
-    else:
+async def predict_file(
+    file: UploadFile = File(...),
+    explain: ExplainMode = "true"
+):
+    try:
+        text = await run_in_threadpool(extract_upload, file.file, file.filename or "")
+    except ExtractionError as e:
         raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type"
+            status_code=e.status_code,
+            detail=e.detail
         )
 
     if not text.strip():
@@ -76,7 +254,14 @@ async def predict_file(file: UploadFile = File(...)):
             detail="No readable text found in file"
         )
 
-    result = predict_text(text)
+    metrics.REQUEST_TEXTS.observe(1, "predict-file")
+    metrics.REQUEST_CHARS.observe(len(text), "predict-file")
+
+    # Long documents are scored per segment (see predict_long_text)
+    async def score():
+        return [await _infer(predict_document, text, explain == "true")]
+
+    result = (await _run_prediction([text], explain, score, segmented=True))[0]
 
     result.setdefault("shap", [])
     result.setdefault("stylometry", {})
@@ -91,7 +276,44 @@ async def predict_file(file: UploadFile = File(...)):
     return result
 
 
+# DEFERRED EXPLANATION
+
+@router.get("/explain/{explanation_id}")
+def explanation(explanation_id: str):
+    result = get_explanation(explanation_id)
+
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Unknown explanation id"
+        )
+
+    return result
+
+
 # HISTORY
+# Newest first, one page at a time. The body stays a plain list
+# for the frontend; the cursor for the next (older) page is sent
+# in the X-Next-Cursor header, absent on the last page.
+
 @router.get("/history")
-def history():
-    return get_history()
+def history(
+    response: Response,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+    label: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+):
+    entries, next_cursor = get_history(
+        limit=limit,
+        cursor=cursor,
+        label=label,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None
+    )
+
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+
+    return entries
@@ -1,8 +1,13 @@
+from typing import List
+
 from pydantic import BaseModel
 
 class TextRequest(BaseModel):
     text: str
 
+class BatchTextRequest(BaseModel):
+    texts: List[str]
+
 class PredictionResponse(BaseModel):
     label: str
     confidence: float
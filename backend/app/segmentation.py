@@ -0,0 +1,73 @@
+import re
+from bisect import bisect_left
+
+# ==================================================
+# LONG-DOCUMENT SEGMENTATION
+# ==================================================
+# Splits a document into runs of whole sentences of about
+# `target_words` words, never crossing a paragraph break once a
+# segment has `min_words`. A single sentence longer than
+# `target_words` (e.g. unpunctuated text) is cut at word
+# boundaries. Segments are (start, end) character offsets into the
+# original text, so each can be reported back against the
+# document it came from.
+
+# Sentence: everything up to terminal punctuation (plus closing
+# quotes/brackets) followed by whitespace, or up to a line break
+_SENTENCE_RE = re.compile(r"\S.*?(?:[.!?]+[\"')\]]*(?=\s)|(?=\n)|\Z)", re.DOTALL)
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_WORD_RE = re.compile(r"\S+")
+
+
+def _sentences(text, max_words):
+    """
+    Yields (start, end, n_words, ends_paragraph) per sentence, in
+    pieces of max_words words for longer sentences.
+    """
+    breaks = [m.start() for m in _PARAGRAPH_RE.finditer(text)]
+
+    for m in _SENTENCE_RE.finditer(text):
+        start, end = m.span()
+        b = bisect_left(breaks, end)
+        ends_paragraph = b < len(breaks) and not text[end:breaks[b]].strip()
+
+        n_words = len(m.group().split())
+        if n_words <= max_words:
+            yield start, end, n_words, ends_paragraph
+            continue
+
+        words = [w.span() for w in _WORD_RE.finditer(text, start, end)]
+        for i in range(0, len(words), max_words):
+            piece = words[i:i + max_words]
+            last = i + max_words >= len(words)
+            yield piece[0][0], piece[-1][1], len(piece), ends_paragraph and last
+
+
+def segment_text(text, target_words=200, min_words=60):
+    """
+    Returns [(start, end, n_words), ...] covering every sentence of
+    text in order. A trailing segment shorter than min_words is
+    merged into the one before it.
+    """
+    segments = []
+    start = end = None
+    words = 0
+
+    for s_start, s_end, n_words, ends_paragraph in _sentences(text, target_words):
+        if start is None:
+            start = s_start
+        end = s_end
+        words += n_words
+
+        if words >= target_words or (ends_paragraph and words >= min_words):
+            segments.append((start, end, words))
+            start, words = None, 0
+
+    if start is not None:
+        if segments and words < min_words:
+            prev_start, _, prev_words = segments.pop()
+            segments.append((prev_start, end, prev_words + words))
+        else:
+            segments.append((start, end, words))
+
+    return segments
@@ -0,0 +1,186 @@
+import re
+import json
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+# ==================================================
+# COMPACT TF-IDF (transform-only)
+# ==================================================
+# The parts of a fitted TfidfVectorizer that transform() reads:
+# the sorted vocabulary (column i is the i-th term, as in sklearn),
+# the IDF weights and the analyzer settings. Pruned-term state
+# (stop_words_ on older sklearn, which holds every n-gram cut by
+# max_features / min_df) is not carried over.
+#
+# Saved as a newline-separated term list, idf.npy and a JSON config.
+# The IDF stays float64: sklearn multiplies counts by float64 IDF
+# before the L2 norm, and a float32 copy shifts feature values by
+# ~1e-8, enough to move rows across forest split thresholds. At 8
+# bytes per term it is a small part of the artifact anyway.
+#
+# transform() output is bit-identical to the source vectorizer's.
+
+_SUPPORTED = {
+    "analyzer": "word",
+    "input": "content",
+    "preprocessor": None,
+    "tokenizer": None,
+    "strip_accents": None,
+}
+
+
+class CompactTfidf:
+
+    def __init__(self, terms, idf, token_pattern, lowercase, stop_words, ngram_range,
+                 binary=False, sublinear_tf=False, norm="l2"):
+        self.terms = terms              # sorted feature names (column order)
+        self.idf = idf                  # float64 (n_terms,), or None without use_idf
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.stop_words = frozenset(stop_words or ())
+        self.ngram_range = tuple(ngram_range)
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+        self._index = {term: i for i, term in enumerate(terms)}
+        self._token_re = re.compile(token_pattern)
+        self._feature_names = None
+
+    @property
+    def n_terms(self):
+        return len(self.terms)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer):
+        params = vectorizer.get_params()
+        for name, expected in _SUPPORTED.items():
+            if params[name] != expected:
+                raise ValueError(f"CompactTfidf does not support {name}={params[name]!r}")
+        if re.compile(params["token_pattern"]).groups > 1:
+            raise ValueError("token_pattern may have at most one capturing group")
+
+        terms = list(vectorizer.get_feature_names_out())
+        idf = np.asarray(vectorizer.idf_, dtype=np.float64) if params["use_idf"] else None
+        stop_words = vectorizer.get_stop_words()
+
+        return cls(
+            terms, idf,
+            token_pattern=params["token_pattern"],
+            lowercase=params["lowercase"],
+            stop_words=sorted(stop_words) if stop_words else [],
+            ngram_range=params["ngram_range"],
+            binary=params["binary"],
+            sublinear_tf=params["sublinear_tf"],
+            norm=params["norm"],
+        )
+
+    def _config(self):
+        return {
+            "token_pattern": self.token_pattern,
+            "lowercase": self.lowercase,
+            "stop_words": sorted(self.stop_words),
+            "ngram_range": list(self.ngram_range),
+            "binary": self.binary,
+            "sublinear_tf": self.sublinear_tf,
+            "norm": self.norm,
+        }
+
+    def save(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        (directory / "terms.txt").write_text("\n".join(self.terms), encoding="utf-8")
+        if self.idf is not None:
+            np.save(directory / "idf.npy", np.ascontiguousarray(self.idf))
+        (directory / "tfidf.json").write_text(json.dumps(self._config()))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        directory = Path(directory)
+        config = json.loads((directory / "tfidf.json").read_text())
+        terms = (directory / "terms.txt").read_text(encoding="utf-8").split("\n")
+
+        idf_path = directory / "idf.npy"
+        idf = np.load(idf_path, mmap_mode="r" if mmap else None) if idf_path.exists() else None
+        return cls(terms, idf, **config)
+
+    # ----------------------------------------------
+    # Transform
+    # ----------------------------------------------
+
+    def get_feature_names_out(self):
+        if self._feature_names is None:
+            self._feature_names = np.asarray(self.terms, dtype=object)
+        return self._feature_names
+
+    def _tokens(self, doc, lowered=False):
+        if self.lowercase and not lowered:
+            doc = doc.lower()
+        tokens = self._token_re.findall(doc)
+        if self.stop_words:
+            stop_words = self.stop_words
+            tokens = [t for t in tokens if t not in stop_words]
+        return tokens
+
+    def term_counts(self, doc, lowered=False):
+        """
+        {column: count} of the in-vocabulary n-grams of doc. N-grams
+        are looked up one at a time and never collected into a list.
+        Pass lowered=True when doc is already text.lower().
+        """
+        counts = {}
+        tokens = self._tokens(doc, lowered)
+        index = self._index
+        min_n, max_n = self.ngram_range
+        n_tokens = len(tokens)
+
+        for n in range(min_n, min(max_n, n_tokens) + 1):
+            for i in range(n_tokens - n + 1):
+                col = index.get(tokens[i] if n == 1 else " ".join(tokens[i:i + n]))
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+        return counts
+
+    def transform(self, texts):
+        return self.matrix([self.term_counts(doc) for doc in texts])
+
+    def matrix(self, term_counts):
+        """
+        TF-IDF matrix (CSR, one row per document) from term_counts()
+        dicts.
+        """
+        indptr = [0]
+        indices = []
+        values = []
+
+        for counts in term_counts:
+            cols = sorted(counts)
+            indices.extend(cols)
+            values.extend(counts[c] for c in cols)
+            indptr.append(len(indices))
+
+        X = csr_matrix(
+            (
+                np.asarray(values, dtype=np.float64),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int64),
+            ),
+            shape=(len(indptr) - 1, self.n_terms),
+        )
+
+        # Same steps, in the same order, as CountVectorizer +
+        # TfidfTransformer.transform
+        if self.binary:
+            X.data.fill(1)
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        if self.idf is not None:
+            X.data *= self.idf[X.indices]
+        if self.norm:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
@@ -0,0 +1,105 @@
+"""
+Startup time and per-worker memory: pickles vs the shared bundle.
+
+Starts N worker processes at once for each loading mode. Each one
+runs model.warm_up(), as the server does at start-up (context, the
+SHAP explainer unless explanations are sparse, one prediction), and
+then reports its load time and memory from /proc (Linux only). PSS splits shared
+pages between the processes that map them, so it shows what each
+worker really costs.
+
+Usage (from backend/, after `python -m app.artifacts export`):
+    python -m benchmarks.artifact_load [--workers 4] [--output report.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _proc_kb(path, fields):
+    out = {}
+    with open(path) as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in fields:
+                out[key] = int(rest.split()[0])
+    return out
+
+
+def _worker():
+    start = time.perf_counter()
+
+    from app import model
+    model.warm_up()
+
+    elapsed = time.perf_counter() - start
+    status = _proc_kb("/proc/self/status", {"VmRSS", "RssAnon", "RssFile"})
+    rollup = _proc_kb("/proc/self/smaps_rollup", {"Pss"})
+
+    print(json.dumps({
+        "explain_mode": model.get_context().explain_mode,
+        "load_seconds": round(elapsed, 3),
+        "rss_mb": round(status["VmRSS"] / 1024, 1),
+        "rss_anon_mb": round(status["RssAnon"] / 1024, 1),
+        "rss_file_mb": round(status["RssFile"] / 1024, 1),
+        "pss_mb": round(rollup["Pss"] / 1024, 1),
+    }), flush=True)
+
+    # Stay alive until every sibling has measured, so shared
+    # pages are counted against all of them
+    sys.stdin.read()
+
+
+def _run(mode, workers):
+    env = dict(os.environ, ORIGINAI_SHARED_ARTIFACTS="1" if mode == "shared" else "0")
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.artifact_load", "--worker"],
+            cwd=BACKEND_DIR, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        for _ in range(workers)
+    ]
+
+    reports = [json.loads(p.stdout.readline()) for p in procs]
+    for p in procs:
+        p.communicate("")
+
+    return {
+        "workers": reports,
+        "mean_load_seconds": round(sum(r["load_seconds"] for r in reports) / workers, 3),
+        "total_pss_mb": round(sum(r["pss_mb"] for r in reports), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker()
+        return
+
+    from app.artifacts import bundle_is_current
+    if not bundle_is_current():
+        sys.exit("No current shared bundle; run: python -m app.artifacts export")
+
+    report = {mode: _run(mode, args.workers) for mode in ("pickle", "shared")}
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Confidence cascade benchmark (ORIGINAI_CASCADE_*, app/model.py).
+
+On the validation split of dataset_balanced.csv (same split as
+ml_model/train.py), for each first-tier size in --trees this reports:
+
+- the fraction of texts answered by the first tier (overall and per
+  length bucket), counting short texts, which never escalate
+- forest accuracy and served-label accuracy (short-text gate and
+  LLM-Rewritten check applied, as predict_texts does) with and
+  without the cascade, and how often the labels agree with the
+  full forest's
+- single-text forest latency (p50 / p95) and batch throughput
+
+The escalation thresholds are ORIGINAI_CASCADE_MIN_CONFIDENCE and
+ORIGINAI_CASCADE_MIN_MARGIN. Needs trained artifacts (--model-dir).
+
+Usage (from backend/):
+    python -m benchmarks.cascade [--trees 16,32,64,128] [--limit N]
+                                 [--model-dir models] [--output report.json]
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app import model as pipeline
+from app.artifacts import MODEL_DIR
+from app.config import CASCADE_MIN_CONFIDENCE, CASCADE_MIN_MARGIN
+from benchmarks.fixtures import DATASET_PATH
+from ml_model.src.resources import ensure_nltk_resources
+
+
+def _cascade(forest, k, X, settled):
+    """
+    ModelContext.cascade_proba with a first tier of k trees.
+    """
+    fast, rest = forest.subset(0, k), forest.subset(k, forest.n_trees)
+    proba = fast.predict_proba(X)
+    early = pipeline._is_confident(proba) | settled
+    escalate = np.flatnonzero(~early)
+    if escalate.size:
+        n = forest.n_trees
+        proba[escalate] = (k * proba[escalate] + (n - k) * rest.predict_proba(X[escalate])) / n
+    return proba, early
+
+
+def _served(ctx, proba, short, sentence_stats):
+    labels = ctx.label_encoder.inverse_transform(np.argmax(proba, axis=1)).astype(object)
+    for i in range(len(labels)):
+        if short[i]:
+            labels[i] = "Human"
+        elif pipeline._is_llm_rewritten(sentence_stats[i]):
+            labels[i] = "LLM-Rewritten"
+    return labels
+
+
+def _latency(fn, X, short, rows):
+    ms = []
+    for i in range(min(rows, X.shape[0])):
+        start = time.perf_counter()
+        fn(X[i], short[i:i + 1])
+        ms.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    fn(X, short)
+    batch = time.perf_counter() - start
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "batch_per_second": round(X.shape[0] / batch, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--trees", default="16,32,64,128", help="first-tier sizes to try")
+    parser.add_argument("--limit", type=int, default=0, help="validation rows to use (0 = all)")
+    parser.add_argument("--latency-rows", type=int, default=300)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    ensure_nltk_resources(download=True)
+    ctx = pipeline.load_context(args.model_dir)
+    forest = ctx.forest
+
+    df = pd.read_csv(DATASET_PATH)
+    _, val_idx = train_test_split(
+        np.arange(len(df)), test_size=0.2, random_state=42,
+        stratify=ctx.label_encoder.transform(df["label"])
+    )
+    if args.limit:
+        val_idx = val_idx[:args.limit]
+    val = df.iloc[val_idx]
+
+    texts = val["text"].tolist()
+    truth = val["label"].to_numpy()
+    buckets = val["bucket"].to_numpy() if "bucket" in val else np.full(len(val), "all")
+
+    X, _, sentence_stats = pipeline._build_features(ctx, texts)
+    short = np.fromiter((pipeline._is_short(t) for t in texts), dtype=bool, count=len(texts))
+
+    full_proba = forest.predict_proba(X)
+    full_forest = ctx.label_encoder.inverse_transform(np.argmax(full_proba, axis=1))
+    full_served = _served(ctx, full_proba, short, sentence_stats)
+
+    report = {
+        "rows": len(texts),
+        "trees": forest.n_trees,
+        "min_confidence": CASCADE_MIN_CONFIDENCE,
+        "min_margin": CASCADE_MIN_MARGIN,
+        "short_fraction": round(float(short.mean()), 4),
+        "full": {
+            "forest_accuracy": round(float(np.mean(full_forest == truth)), 4),
+            "served_accuracy": round(float(np.mean(full_served == truth)), 4),
+            **_latency(lambda x, s: forest.predict_proba(x), X, short, args.latency_rows),
+        },
+        "cascade": {},
+    }
+
+    for k in (int(t) for t in args.trees.split(",") if t.strip()):
+        if not 0 < k < forest.n_trees:
+            continue
+
+        proba, early = _cascade(forest, k, X, short)
+        forest_labels = ctx.label_encoder.inverse_transform(np.argmax(proba, axis=1))
+        served = _served(ctx, proba, short, sentence_stats)
+
+        report["cascade"][str(k)] = {
+            "early_exit_fraction": round(float(early.mean()), 4),
+            "early_exit_by_bucket": {
+                str(b): round(float(early[buckets == b].mean()), 4) for b in sorted(set(buckets))
+            },
+            "forest_accuracy": round(float(np.mean(forest_labels == truth)), 4),
+            "served_accuracy": round(float(np.mean(served == truth)), 4),
+            "forest_agreement_with_full": round(float(np.mean(forest_labels == full_forest)), 4),
+            "served_agreement_with_full": round(float(np.mean(served == full_served)), 4),
+            "max_confidence_change": round(float(np.abs(proba.max(axis=1) - full_proba.max(axis=1)).max()), 4),
+            **_latency(lambda x, s, k=k: _cascade(forest, k, x, s), X, short, args.latency_rows),
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
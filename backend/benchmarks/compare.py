@@ -0,0 +1,67 @@
+"""
+Compares two benchmarks.suite reports, metric by metric.
+
+Usage (from backend/):
+    python -m benchmarks.compare before.json after.json [--threshold 5]
+
+Prints every shared numeric result with its relative change; rows
+that moved by more than --threshold percent are marked. Latencies
+(*_ms, seconds) are better when lower, rates (*per_second) when higher.
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+
+def _flatten(node, prefix=""):
+    out = {}
+    for key, value in node.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            out.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            out[path] = value
+    return out
+
+
+def _higher_is_better(path):
+    return path.endswith("per_second")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    parser.add_argument("--threshold", type=float, default=5.0, help="percent change to flag")
+    args = parser.parse_args()
+
+    before = json.loads(args.before.read_text())
+    after = json.loads(args.after.read_text())
+
+    print(f"before: {before['meta'].get('commit')}  after: {after['meta'].get('commit')}")
+
+    old, new = _flatten(before["results"]), _flatten(after["results"])
+    regressions = 0
+
+    for path in sorted(old.keys() & new.keys()):
+        if not (path.endswith("_ms") or path.endswith("per_second") or path.endswith("seconds")):
+            continue
+        a, b = old[path], new[path]
+        if not a:
+            continue
+
+        change = 100 * (b - a) / a
+        better = change > 0 if _higher_is_better(path) else change < 0
+        mark = ""
+        if abs(change) > args.threshold:
+            mark = "  faster" if better else "  SLOWER"
+            regressions += not better
+
+        print(f"{path:60s} {a:>12.3f} {b:>12.3f} {change:>+8.1f}%{mark}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
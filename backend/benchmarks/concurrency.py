@@ -0,0 +1,149 @@
+"""
+Throughput vs concurrency, with and without the thread limits of
+app/concurrency.py.
+
+For each mode and forest engine, --processes server-like processes
+start together (standing in for uvicorn workers). Each loads the
+artifacts and then, at every concurrency level, sends --requests
+predict_text calls (explain=False, result cache off) from that many
+threads at once. Reported per level: total texts/s over all
+processes and the p50 / p95 latency of a call.
+
+Modes:
+    unlimited   ORIGINAI_MODEL_THREADS=0: n_jobs from the pickle
+                (-1), library-default BLAS / OpenMP pools (the old
+                behaviour)
+    limited     ORIGINAI_MODEL_THREADS (default 1)
+
+Usage (from backend/, with trained artifacts in backend/models):
+    python -m benchmarks.concurrency [--levels 1,2,4,8,16] [--requests 200]
+                                     [--engines sklearn,flat] [--processes 1]
+                                     [--output report.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+MODES = {
+    "unlimited": {"ORIGINAI_MODEL_THREADS": "0"},
+    "limited": {},
+}
+
+
+def _worker(levels, requests):
+    from app.model import get_context, predict_text
+    from benchmarks import fixtures
+
+    get_context()
+    texts = [t for bucket in fixtures.load("data_fix", samples=20).values() for t in bucket]
+    predict_text(texts[0], explain=False)
+
+    # Start every process's measurements together
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+    out = {}
+    for level in levels:
+        def call(i):
+            start = time.perf_counter()
+            predict_text(texts[i % len(texts)], explain=False)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as pool:
+            seconds = list(pool.map(call, range(requests)))
+        wall = time.perf_counter() - start
+
+        ms = np.array(seconds) * 1000
+        out[str(level)] = {
+            "wall_seconds": wall,
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+        }
+    print(json.dumps(out), flush=True)
+
+
+def _run(mode, engine, args):
+    env = dict(
+        os.environ,
+        ORIGINAI_FOREST_ENGINE=engine,
+        ORIGINAI_CACHE_SIZE="0",
+        ORIGINAI_METRICS="0",
+        **MODES[mode],
+    )
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.concurrency", "--worker",
+             "--levels", args.levels, "--requests", str(args.requests)],
+            cwd=BACKEND_DIR, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        for _ in range(args.processes)
+    ]
+    for p in procs:
+        if p.stdout.readline().strip() != "ready":
+            sys.exit(f"{mode}/{engine} worker failed to start")
+    for p in procs:
+        p.stdin.write("\n")
+        p.stdin.flush()
+
+    reports = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+
+    out = {}
+    for level in reports[0]:
+        runs = [r[level] for r in reports]
+        out[level] = {
+            "texts_per_second": round(
+                sum(args.requests / r["wall_seconds"] for r in runs), 1
+            ),
+            "p50_ms": round(float(np.mean([r["p50_ms"] for r in runs])), 2),
+            "p95_ms": round(float(np.mean([r["p95_ms"] for r in runs])), 2),
+        }
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--levels", default="1,2,4,8,16", help="client threads per process")
+    parser.add_argument("--requests", type=int, default=200, help="calls per level and process")
+    parser.add_argument("--engines", default="sklearn,flat")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    if args.worker:
+        _worker(levels, args.requests)
+        return
+
+    report = {
+        "cpus": os.cpu_count(),
+        "processes": args.processes,
+        "requests": args.requests,
+        "results": {},
+    }
+    for engine in (e.strip() for e in args.engines.split(",") if e.strip()):
+        for mode in MODES:
+            print(f"... {engine} / {mode}", file=sys.stderr, flush=True)
+            report["results"][f"{engine}/{mode}"] = _run(mode, engine, args)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
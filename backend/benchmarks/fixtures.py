@@ -0,0 +1,133 @@
+"""
+Benchmark fixtures: texts grouped by (label, length bucket).
+
+    data_fix  - data_fix/{human,ai,rewritten}/{short,medium,long}.txt
+    dataset   - dataset_balanced.csv, grouped by its label/bucket columns
+
+Sampling is seeded so every run (and every commit) sees the same texts.
+"""
+import random
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = BACKEND_DIR.parent
+DATA_FIX_DIR = PROJECT_ROOT / "data_fix"
+DATASET_PATH = PROJECT_ROOT / "dataset_balanced.csv"
+
+LABELS = ("human", "ai", "rewritten")
+BUCKETS = ("short", "medium", "long")
+
+# data_fix files hold one text per paragraph, except the short
+# buckets, which hold one text per line
+_MIN_PARAGRAPHS = 10
+
+
+def _split_texts(raw):
+    texts = [t.strip() for t in raw.split("\n\n") if t.strip()]
+    if len(texts) < _MIN_PARAGRAPHS:
+        texts = [t.strip() for t in raw.splitlines() if t.strip()]
+    return texts
+
+
+def _sample(texts, n, seed):
+    if n and len(texts) > n:
+        return random.Random(seed).sample(texts, n)
+    return list(texts)
+
+
+def load_data_fix(samples=50, seed=0):
+    """
+    {"human/short": [...], ...} from the data_fix directory.
+    """
+    out = {}
+    for label in LABELS:
+        for bucket in BUCKETS:
+            path = DATA_FIX_DIR / label / f"{bucket}.txt"
+            if path.exists():
+                texts = _split_texts(path.read_text(encoding="utf-8", errors="ignore"))
+                out[f"{label}/{bucket}"] = _sample(texts, samples, seed)
+    return out
+
+
+def load_dataset(samples=50, seed=0):
+    """
+    {"human/short": [...], ...} from dataset_balanced.csv.
+    """
+    df = pd.read_csv(DATASET_PATH)
+    labels = df["label"].str.lower().str.replace("llm-", "", regex=False)
+
+    out = {}
+    for (label, bucket), group in df.groupby([labels, "bucket"]):
+        out[f"{label}/{bucket}"] = _sample(group["text"].tolist(), samples, seed)
+    return dict(sorted(out.items()))
+
+
+def load(source="data_fix", samples=50, seed=0):
+    if source == "data_fix":
+        return load_data_fix(samples, seed)
+    if source == "dataset":
+        return load_dataset(samples, seed)
+    raise ValueError(f"Unknown fixture source: {source}")
+
+
+# ----------------------------------------------
+# Synthetic documents for the file extraction benchmark
+# ----------------------------------------------
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(texts, lines_per_page=60):
+    """
+    Minimal text PDF (Helvetica, one text object per page); enough
+    for PyPDF2 to extract the text back. Each text starts a new page
+    and runs onto further pages as needed.
+    """
+    pages = []
+    for text in texts:
+        words = text.encode("latin-1", errors="ignore").decode("latin-1").split()
+        lines = [" ".join(words[j:j + 12]) for j in range(0, len(words), 12)] or [""]
+        pages.extend(lines[j:j + lines_per_page] for j in range(0, len(lines), lines_per_page))
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None]
+    page_ids = []
+    font_id = 3 + 2 * len(pages)
+
+    for i, lines in enumerate(pages):
+        body = " ".join(f"({_pdf_escape(line)}) Tj T*" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 40 760 Td {body} ET"
+
+        page_ids.append(3 + 2 * i)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {4 + 2 * i} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    objects[1] = "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+        " ".join(f"{p} 0 R" for p in page_ids), len(pages)
+    )
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out, offsets = "%PDF-1.4\n", []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out.encode("latin-1")))
+        out += f"{i + 1} 0 obj\n{obj}\nendobj\n"
+
+    xref = len(out.encode("latin-1"))
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def make_docx(paragraphs, path):
+    import docx
+
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    document.save(path)
@@ -0,0 +1,131 @@
+"""
+Forest engine benchmark: FlatForest (app/forest.py) vs sklearn.
+
+On validation rows of dataset_balanced.csv (same split as
+ml_model/train.py) this checks that both engines return the same
+class probabilities and reports:
+
+- single-row latency (p50 / p95) for each engine
+- batch throughput at a few batch sizes
+
+Exits non-zero when the probabilities differ by more than --tolerance.
+Needs trained artifacts in backend/models.
+
+Usage (from backend/):
+    python -m benchmarks.forest_engine [--limit N] [--output report.json]
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.sparse import hstack, csr_matrix
+from sklearn.model_selection import train_test_split
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.forest import FlatForest
+from ml_model.src.features.stylometric import StylometricExtractor
+from ml_model.src.resources import ensure_nltk_resources
+
+DATA_PATH = BACKEND_DIR.parent / "dataset_balanced.csv"
+MODEL_DIR = BACKEND_DIR / "models"
+
+BATCH_SIZES = (1, 32, 256)
+
+
+def _latencies(fn, rows):
+    out = []
+    for row in rows:
+        start = time.perf_counter()
+        fn(row)
+        out.append(time.perf_counter() - start)
+    return np.array(out) * 1000
+
+
+def _throughput(fn, X, batch_size, repeat=3):
+    n = min(batch_size, X.shape[0])
+    batch = X[:n]
+    fn(batch)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(batch)
+    elapsed = (time.perf_counter() - start) / repeat
+    return round(n / elapsed, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=500, help="validation rows to use (0 = all)")
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    ensure_nltk_resources(download=True)
+
+    model = joblib.load(MODEL_DIR / "text_origin_model.pkl")
+    tfidf = joblib.load(MODEL_DIR / "tfidf_vectorizer.pkl")
+    label_encoder = joblib.load(MODEL_DIR / "label_encoder.pkl")
+
+    df = pd.read_csv(DATA_PATH)
+    y = label_encoder.transform(df["label"])
+    _, val_idx = train_test_split(
+        np.arange(len(df)), test_size=0.2, random_state=42, stratify=y
+    )
+    if args.limit:
+        val_idx = val_idx[:args.limit]
+
+    texts = [df["text"].iloc[i] for i in val_idx]
+    X_style = StylometricExtractor().extract_batch(texts)
+    X = hstack([tfidf.transform(texts), csr_matrix(X_style)], format="csr")
+
+    start = time.perf_counter()
+    forest = FlatForest.from_sklearn(model)
+    convert_seconds = time.perf_counter() - start
+
+    ref = model.predict_proba(X)
+    flat = forest.predict_proba(X)
+    max_diff = float(np.abs(ref - flat).max())
+
+    rows = [X[i] for i in range(X.shape[0])]
+    engines = {"sklearn": model.predict_proba, "flat": forest.predict_proba}
+
+    report = {
+        "rows": X.shape[0],
+        "trees": forest.n_trees,
+        "nodes": int(forest.feature.size),
+        "convert_seconds": round(convert_seconds, 3),
+        "max_abs_diff": max_diff,
+        "same_predictions": bool((ref.argmax(axis=1) == flat.argmax(axis=1)).all()),
+        "single_row_ms": {},
+        "rows_per_second": {},
+    }
+
+    for name, fn in engines.items():
+        ms = _latencies(fn, rows)
+        report["single_row_ms"][name] = {
+            "p50": round(float(np.percentile(ms, 50)), 3),
+            "p95": round(float(np.percentile(ms, 95)), 3),
+        }
+        report["rows_per_second"][name] = {
+            str(b): _throughput(fn, X, b) for b in BATCH_SIZES
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+    if max_diff > args.tolerance:
+        sys.exit(f"FlatForest differs from sklearn by {max_diff:g} (tolerance {args.tolerance:g})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+POS backend benchmark: NLTK perceptron tagger vs lexicon lookup.
+
+Builds a lexicon from the training split of dataset_balanced.csv (same
+split as ml_model/train.py) and reports, on the validation split:
+
+- per-document tagging latency for both backends
+- drift of noun/verb/adj/adv ratios against the NLTK reference
+- coarse tag agreement at the token level
+- classifier accuracy with each backend's stylometric features
+  (when trained artifacts exist in backend/models)
+
+Usage (from backend/):
+    python -m benchmarks.pos_backend [--limit N] [--output report.json]
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from nltk.tokenize import word_tokenize
+
+from ml_model.src.features.pos import NltkPosTagger, LexiconPosTagger
+from ml_model.src.features.stylometric import StylometricExtractor
+from ml_model.src.resources import ensure_nltk_resources
+
+DATA_PATH = BACKEND_DIR.parent / "dataset_balanced.csv"
+MODEL_DIR = BACKEND_DIR / "models"
+
+RATIOS = ("noun_ratio", "verb_ratio", "adj_ratio", "adv_ratio")
+
+
+def _time_counts(tagger, token_lists):
+    rows = []
+    start = time.perf_counter()
+    for words in token_lists:
+        counts = tagger.counts(words)
+        n = len(words)
+        rows.append([c / n if n else 0.0 for c in counts])
+    elapsed = time.perf_counter() - start
+    return np.array(rows), elapsed
+
+
+def _accuracy(texts, y, extractors):
+    import joblib
+    from scipy.sparse import hstack, csr_matrix
+
+    model = joblib.load(MODEL_DIR / "text_origin_model.pkl")
+    tfidf = joblib.load(MODEL_DIR / "tfidf_vectorizer.pkl")
+    X_tfidf = tfidf.transform(texts)
+
+    out, preds = {}, {}
+    for name, extractor in extractors.items():
+        X = hstack([X_tfidf, csr_matrix(extractor.extract_batch(texts))], format="csr")
+        preds[name] = model.predict(X)
+        out[name] = float(np.mean(preds[name] == y))
+
+    out["prediction_agreement"] = float(np.mean(preds["nltk"] == preds["lexicon"]))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=0, help="validation rows to use (0 = all)")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    ensure_nltk_resources(download=True)
+
+    df = pd.read_csv(DATA_PATH)
+
+    y = LabelEncoder().fit_transform(df["label"])
+
+    train_idx, val_idx = train_test_split(
+        np.arange(len(df)), test_size=0.2, random_state=42, stratify=y
+    )
+    if args.limit:
+        val_idx = val_idx[:args.limit]
+
+    texts = df["text"].tolist()
+    train_tokens = [word_tokenize(texts[i].lower()) for i in train_idx]
+    val_tokens = [word_tokenize(texts[i].lower()) for i in val_idx]
+
+    start = time.perf_counter()
+    lexicon = LexiconPosTagger.build(train_tokens)
+    build_seconds = time.perf_counter() - start
+
+    nltk_tagger = NltkPosTagger()
+    ref, nltk_seconds = _time_counts(nltk_tagger, val_tokens)
+    fast, lexicon_seconds = _time_counts(lexicon, val_tokens)
+
+    agree = total = 0
+    for words in val_tokens:
+        a, b = nltk_tagger.tag(words), lexicon.tag(words)
+        agree += sum(x == z for x, z in zip(a, b))
+        total += len(words)
+
+    diff = np.abs(fast - ref)
+    drift = {}
+    for j, name in enumerate(RATIOS):
+        corr = np.corrcoef(ref[:, j], fast[:, j])[0, 1] if ref[:, j].std() else float("nan")
+        drift[name] = {
+            "mean_abs": float(diff[:, j].mean()),
+            "p95_abs": float(np.percentile(diff[:, j], 95)),
+            "max_abs": float(diff[:, j].max()),
+            "pearson": float(corr),
+        }
+
+    n_docs = len(val_tokens)
+    report = {
+        "documents": n_docs,
+        "tokens": total,
+        "lexicon_entries": len(lexicon.lexicon),
+        "lexicon_build_seconds": round(build_seconds, 3),
+        "latency_ms_per_doc": {
+            "nltk": round(1000 * nltk_seconds / n_docs, 4),
+            "lexicon": round(1000 * lexicon_seconds / n_docs, 4),
+        },
+        "speedup": round(nltk_seconds / lexicon_seconds, 1) if lexicon_seconds else None,
+        "token_tag_agreement": round(agree / total, 4) if total else None,
+        "ratio_drift": drift,
+    }
+
+    if (MODEL_DIR / "text_origin_model.pkl").exists():
+        report["accuracy"] = _accuracy(
+            [texts[i] for i in val_idx],
+            y[val_idx],
+            {
+                "nltk": StylometricExtractor(),
+                "lexicon": StylometricExtractor(pos_tagger=lexicon),
+            },
+        )
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Transformer precision benchmark: FP32 vs dynamic int8 DistilBERT
+(TransformerFeatureExtractor precision='fp32' / 'int8').
+
+On a stratified sample of dataset_balanced.csv this reports, per
+precision:
+
+- model size (serialized state dict)
+- single-text embedding latency (p50 / p95) and batch throughput
+- hybrid classifier accuracy on a held-out split
+
+The HybridTextClassifier is trained on FP32 embeddings of the train
+split (or loaded with --model PREFIX) and scored on the test split
+with each precision's embeddings, so the accuracy difference is the
+cost of serving an FP32-trained model with the int8 extractor. Also
+reports how often the two agree and the cosine similarity of their
+embeddings.
+
+Usage (from backend/):
+    python -m benchmarks.quantization [--limit 600] [--threads N]
+                                      [--model models/hybrid_model]
+                                      [--output report.json]
+"""
+import io
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.model_selection import train_test_split
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.fixtures import DATASET_PATH
+from ml_model.src.features.stylometric import StylometricExtractor
+from ml_model.src.features.transformer import TransformerFeatureExtractor
+from ml_model.src.models.hybrid_model import HybridTextClassifier
+from ml_model.src.resources import ensure_nltk_resources
+
+PRECISIONS = TransformerFeatureExtractor.PRECISIONS
+
+
+def _model_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return round(buffer.tell() / 1e6, 1)
+
+
+def _latency(extractor, texts):
+    ms = []
+    for text in texts:
+        start = time.perf_counter()
+        extractor.extract_features(text)
+        ms.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+    }
+
+
+def _sample(limit, seed):
+    df = pd.read_csv(DATASET_PATH)
+    if limit and len(df) > limit:
+        df, _ = train_test_split(df, train_size=limit, random_state=seed, stratify=df["label"])
+    return df["text"].tolist(), df["label"].to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=600, help="dataset rows to use (0 = all)")
+    parser.add_argument("--latency-samples", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, help="torch intra-op threads")
+    parser.add_argument("--model", help="saved HybridTextClassifier prefix (default: train one)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    ensure_nltk_resources(download=True)
+
+    texts, labels = _sample(args.limit, args.seed)
+    train_idx, test_idx = train_test_split(
+        np.arange(len(texts)), test_size=0.2, random_state=42, stratify=labels
+    )
+    X_style = StylometricExtractor().extract_batch(texts)
+
+    report = {
+        "rows": len(texts),
+        "test_rows": len(test_idx),
+        "threads": args.threads or torch.get_num_threads(),
+        "precisions": {},
+    }
+
+    embeddings = {}
+    for precision in PRECISIONS:
+        start = time.perf_counter()
+        extractor = TransformerFeatureExtractor(precision=precision, num_threads=args.threads)
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        embeddings[precision] = extractor.extract_batch(texts, batch_size=args.batch_size)
+        batch_seconds = time.perf_counter() - start
+
+        report["precisions"][precision] = {
+            "load_seconds": round(load_seconds, 2),
+            "model_mb": _model_mb(extractor.model),
+            "single_text": _latency(extractor, texts[:args.latency_samples]),
+            "texts_per_second": round(len(texts) / batch_seconds, 2),
+        }
+        del extractor
+
+    if args.model:
+        classifier = HybridTextClassifier().load(args.model)
+    else:
+        classifier = HybridTextClassifier().fit(
+            X_style[train_idx], embeddings["fp32"][train_idx], labels[train_idx]
+        )
+
+    predictions = {}
+    for precision in PRECISIONS:
+        predictions[precision] = classifier.predict(X_style[test_idx], embeddings[precision][test_idx])
+        report["precisions"][precision]["accuracy"] = round(
+            float(np.mean(predictions[precision] == labels[test_idx])), 4
+        )
+
+    a, b = embeddings["fp32"], embeddings["int8"]
+    cosine = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    report["int8_vs_fp32"] = {
+        "prediction_agreement": round(float(np.mean(predictions["fp32"] == predictions["int8"])), 4),
+        "embedding_cosine_mean": round(float(cosine.mean()), 5),
+        "embedding_cosine_min": round(float(cosine.min()), 5),
+        "speedup": round(
+            report["precisions"]["int8"]["texts_per_second"]
+            / report["precisions"]["fp32"]["texts_per_second"], 2
+        ),
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
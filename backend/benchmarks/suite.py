@@ -0,0 +1,253 @@
+"""
+Benchmark suite: latency and throughput of the detection pipeline.
+
+Per fixture bucket (label/length, see benchmarks/fixtures.py):
+
+    predict     predict_text latency (explain=False, result cache off)
+                and predict_texts batch throughput
+    stylometry  StylometricExtractor.extract_features latency
+    shap        explain_text latency (ORIGINAI_EXPLAIN_MODE)
+    files       app.extraction text extraction of txt / docx / pdf
+                documents built from the bucket's texts
+    train       end-to-end ml_model/train.py wall time, run on a
+                scratch copy so backend/models is left alone
+                (opt-in: --stages ...,train)
+
+Writes one JSON document with the git commit, environment and
+settings, so runs can be diffed with benchmarks/compare.py.
+
+Usage (from backend/, with trained artifacts in backend/models):
+    python -m benchmarks.suite [--source data_fix|dataset] [--samples 50]
+                               [--stages predict,stylometry,shap,files]
+                               [--output results.json]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Every predict_text call must run the pipeline, not hit the cache
+os.environ.setdefault("ORIGINAI_CACHE_SIZE", "0")
+os.environ.setdefault("ORIGINAI_METRICS", "0")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks import fixtures
+
+DEFAULT_STAGES = ("predict", "stylometry", "shap", "files")
+
+
+def _summary(seconds):
+    ms = np.asarray(seconds, dtype=np.float64) * 1000
+    if not ms.size:
+        return {"n": 0}
+    return {
+        "n": int(ms.size),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p90_ms": round(float(np.percentile(ms, 90)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+        "per_second": round(float(ms.size / (ms.sum() / 1000)), 2) if ms.sum() else None,
+    }
+
+
+def _timed_each(fn, items):
+    out = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        out.append(time.perf_counter() - start)
+    return out
+
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=30
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _meta(args):
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--", ".")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "source": args.source,
+        "samples": args.samples,
+        "seed": args.seed,
+        "settings": {k: v for k, v in sorted(os.environ.items()) if k.startswith("ORIGINAI_")},
+    }
+
+
+# ----------------------------------------------
+# Stages
+# ----------------------------------------------
+
+def bench_predict(buckets):
+    from app.model import predict_text, predict_texts
+
+    out = {}
+    for name, texts in buckets.items():
+        latencies = _timed_each(lambda t: predict_text(t, explain=False), texts)
+
+        start = time.perf_counter()
+        predict_texts(texts, explain=False)
+        batch_seconds = time.perf_counter() - start
+
+        out[name] = {
+            **_summary(latencies),
+            "batch_per_second": round(len(texts) / batch_seconds, 2),
+        }
+    return out
+
+
+def bench_stylometry(buckets):
+    from app.model import get_context
+
+    extractor = get_context().stylometric_extractor
+    return {
+        name: _summary(_timed_each(extractor.extract_features, texts))
+        for name, texts in buckets.items()
+    }
+
+
+def bench_shap(buckets, limit):
+    from app.model import explain_text, get_context
+
+    ctx = get_context()
+    if ctx.explain_mode != "sparse":
+        ctx.explainer
+
+    out = {"mode": ctx.explain_mode}
+    for name, texts in buckets.items():
+        out[name] = _summary(_timed_each(explain_text, texts[:limit]))
+    return out
+
+
+def bench_files(buckets, repeat=3):
+    from app.extraction import extract_text
+
+    out = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for name, texts in buckets.items():
+            stem = name.replace("/", "_")
+            paths = {
+                "txt": tmp / f"{stem}.txt",
+                "docx": tmp / f"{stem}.docx",
+                "pdf": tmp / f"{stem}.pdf",
+            }
+            paths["txt"].write_text("\n\n".join(texts), encoding="utf-8")
+            fixtures.make_docx(texts, paths["docx"])
+            paths["pdf"].write_bytes(fixtures.make_pdf(texts))
+
+            out[name] = {}
+            for kind, path in paths.items():
+                seconds, chars = [], 0
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    chars = len(extract_text(path, kind, max_chars=0))
+                    seconds.append(time.perf_counter() - start)
+
+                best = min(seconds)
+                size = path.stat().st_size
+                out[name][kind] = {
+                    "bytes": size,
+                    "chars": chars,
+                    "best_ms": round(best * 1000, 3),
+                    "mb_per_second": round(size / best / 1e6, 2) if best else None,
+                }
+    return out
+
+
+def bench_train():
+    """
+    Runs ml_model/train.py from a scratch copy of ml_model/ whose
+    models/ directory is thrown away afterwards.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        scratch = Path(tmp) / "backend"
+        shutil.copytree(
+            BACKEND_DIR / "ml_model", scratch / "ml_model",
+            ignore=shutil.ignore_patterns("__pycache__")
+        )
+        os.symlink(fixtures.DATASET_PATH, Path(tmp) / fixtures.DATASET_PATH.name)
+
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "ml_model/train.py"],
+            cwd=scratch, capture_output=True, text=True
+        )
+        seconds = time.perf_counter() - start
+
+        return {
+            "seconds": round(seconds, 2),
+            "returncode": proc.returncode,
+            "stderr_tail": proc.stderr[-2000:] if proc.returncode else "",
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", choices=("data_fix", "dataset"), default="data_fix")
+    parser.add_argument("--samples", type=int, default=50, help="texts per bucket (0 = all)")
+    parser.add_argument("--shap-samples", type=int, default=10, help="texts per bucket for the shap stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES))
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+
+    from ml_model.src.resources import ensure_nltk_resources
+    ensure_nltk_resources(download=True)
+
+    buckets = fixtures.load(args.source, args.samples, args.seed)
+    report = {"meta": _meta(args), "buckets": {k: len(v) for k, v in buckets.items()}, "results": {}}
+
+    if {"predict", "stylometry", "shap"} & set(stages):
+        from app.model import get_context
+
+        start = time.perf_counter()
+        report["meta"]["artifact_version"] = get_context().version
+        report["meta"]["load_seconds"] = round(time.perf_counter() - start, 3)
+
+    runners = {
+        "predict": lambda: bench_predict(buckets),
+        "stylometry": lambda: bench_stylometry(buckets),
+        "shap": lambda: bench_shap(buckets, args.shap_samples),
+        "files": lambda: bench_files(buckets),
+        "train": bench_train,
+    }
+    for stage in stages:
+        if stage not in runners:
+            sys.exit(f"Unknown stage: {stage}")
+        print(f"... {stage}", file=sys.stderr, flush=True)
+        report["results"][stage] = runners[stage]()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+TF-IDF artifact benchmark: pickled TfidfVectorizer vs CompactTfidf
+(app/tfidf.py, as exported into the shared bundle).
+
+Reports for each format:
+
+- size on disk
+- load time and the RSS it adds, measured in a fresh process per
+  format (Linux only, from /proc/self/status)
+- transform throughput on dataset texts
+
+and checks that CompactTfidf.transform is bit-identical to the
+vectorizer (exits non-zero otherwise). Also shows how far a float32
+IDF would move feature values, which is why the export keeps float64.
+
+Usage (from backend/):
+    python -m benchmarks.tfidf_artifact [--model-dir models] [--limit 2000]
+                                        [--output report.json]
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.artifacts import MODEL_DIR
+from app.tfidf import CompactTfidf
+from benchmarks.fixtures import DATASET_PATH
+
+
+def _rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _load_worker(fmt, path):
+    # Import everything first so only the artifact itself is measured
+    import sklearn.feature_extraction.text  # noqa: F401
+
+    before = _rss_kb()
+    start = time.perf_counter()
+    if fmt == "pickle":
+        joblib.load(path)
+    else:
+        CompactTfidf.load(path)
+    seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "load_ms": round(seconds * 1000, 2),
+        "rss_added_mb": round((_rss_kb() - before) / 1024, 2),
+    }))
+
+
+def _measure_load(fmt, path, repeat):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.tfidf_artifact", "--worker", fmt, str(path)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        "load_ms": min(r["load_ms"] for r in runs),
+        "rss_added_mb": float(np.median([r["rss_added_mb"] for r in runs])),
+    }
+
+
+def _dir_bytes(path):
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _throughput(transform, texts, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transform(texts)
+        best = min(best, time.perf_counter() - start)
+    return round(len(texts) / best, 1)
+
+
+def main():
+    if sys.argv[1:2] == ["--worker"]:
+        _load_worker(sys.argv[2], sys.argv[3])
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--limit", type=int, default=2000, help="dataset texts to transform (0 = all)")
+    parser.add_argument("--repeat", type=int, default=3, help="load runs per format")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    pickle_path = args.model_dir / "tfidf_vectorizer.pkl"
+    vectorizer = joblib.load(pickle_path)
+    compact = CompactTfidf.from_sklearn(vectorizer)
+
+    texts = pd.read_csv(DATASET_PATH)["text"].tolist()
+    if args.limit:
+        texts = texts[:args.limit]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        compact_path = Path(tmp) / "tfidf"
+        compact.save(compact_path)
+
+        report = {
+            "terms": compact.n_terms,
+            "pruned_terms_in_pickle": len(getattr(vectorizer, "stop_words_", ()) or ()),
+            "formats": {
+                "pickle": {"bytes": _dir_bytes(pickle_path), **_measure_load("pickle", pickle_path, args.repeat)},
+                "compact": {"bytes": _dir_bytes(compact_path), **_measure_load("compact", compact_path, args.repeat)},
+            },
+        }
+
+    expected = vectorizer.transform(texts)
+    actual = compact.transform(texts)
+    identical = (
+        np.array_equal(expected.indptr, actual.indptr)
+        and np.array_equal(expected.indices, actual.indices)
+        and np.array_equal(expected.data, actual.data)
+    )
+
+    compact32 = CompactTfidf.from_sklearn(vectorizer)
+    compact32.idf = compact32.idf.astype(np.float32).astype(np.float64)
+    drift = float(np.abs(compact32.transform(texts).data - expected.data).max(initial=0.0))
+
+    report["formats"]["pickle"]["texts_per_second"] = _throughput(vectorizer.transform, texts)
+    report["formats"]["compact"]["texts_per_second"] = _throughput(compact.transform, texts)
+    report["bit_identical"] = identical
+    report["float32_idf_max_abs_diff"] = drift
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+    if not identical:
+        sys.exit("CompactTfidf.transform differs from the pickled vectorizer")
+
+
+if __name__ == "__main__":
+    main()
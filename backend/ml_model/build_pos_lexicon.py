@@ -0,0 +1,37 @@
+import pandas as pd
+from pathlib import Path
+
+from nltk.tokenize import word_tokenize
+
+from src.features.pos import LexiconPosTagger
+from src.resources import ensure_nltk_resources
+
+# ==================================================
+# Paths
+# ==================================================
+
+BASE_DIR = Path(__file__).resolve().parent.parent          # backend/
+PROJECT_ROOT = BASE_DIR.parent
+DATA_PATH = PROJECT_ROOT / "dataset_balanced.csv"
+
+MODEL_DIR = BASE_DIR / "models"
+MODEL_DIR.mkdir(parents=True, exist_ok=True)
+
+LEXICON_PATH = MODEL_DIR / "pos_lexicon.json"
+
+# ==================================================
+# Build word -> coarse POS lexicon from the training corpus
+# ==================================================
+
+ensure_nltk_resources(download=True)
+
+df = pd.read_csv(DATA_PATH)
+print("Dataset loaded:", df.shape)
+
+tokens = [word_tokenize(text.lower()) for text in df["text"]]
+
+tagger = LexiconPosTagger.build(tokens)
+tagger.save(LEXICON_PATH)
+
+print("Lexicon entries:", len(tagger.lexicon))
+print("✅ Saved:", LEXICON_PATH.resolve())
@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import sklearn
+from scipy import sparse
+
+from .features.stylometric import StylometricExtractor, FEATURE_NAMES, EXTRACTOR_VERSION
+
+# ==================================================
+# Training features: parallel extraction + on-disk cache
+# ==================================================
+# Stylometric rows are sharded across a process pool. The
+# stylometric matrix and the fitted TF-IDF vectorizer + matrix are
+# cached under a key built from the dataset hash and the extractor /
+# vectorizer configuration, so re-running train.py with different
+# forest settings only pays for model fitting.
+
+
+def dataset_hash(texts):
+    digest = hashlib.blake2b(digest_size=16)
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _cache_key(*parts):
+    raw = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+# ----------------------------------------------
+# Parallel stylometric extraction
+# ----------------------------------------------
+
+_worker_extractor = None
+
+
+def _init_worker():
+    global _worker_extractor
+    _worker_extractor = StylometricExtractor()
+
+
+def _extract_chunk(texts):
+    return _worker_extractor.extract_batch(texts)
+
+
+def extract_stylometric(texts, workers=0, chunk_size=250):
+    """
+    StylometricExtractor().extract_batch(texts), with chunks of rows
+    spread over `workers` processes (0 = one per CPU). Row order is
+    preserved.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(texts) <= chunk_size:
+        return StylometricExtractor().extract_batch(texts)
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return np.vstack(list(pool.map(_extract_chunk, chunks)))
+
+
+# ----------------------------------------------
+# Cache
+# ----------------------------------------------
+
+class FeatureCache:
+    """
+    Stylometric and TF-IDF matrices keyed by dataset hash and feature
+    configuration. Each getter returns (value, hit). A disabled cache
+    always computes and never writes.
+    """
+
+    def __init__(self, directory, enabled=True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+        if enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name, key, suffix):
+        return self.directory / f"{name}-{key}{suffix}"
+
+    @staticmethod
+    def _atomic(path, write):
+        # Write to a temp file first so an interrupted run never
+        # leaves a truncated entry behind
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+
+    def stylometric(self, texts, data_hash, workers=0):
+        key = _cache_key("stylometric", data_hash, EXTRACTOR_VERSION, FEATURE_NAMES)
+        path = self._path("stylometric", key, ".npy")
+
+        if self.enabled and path.exists():
+            return np.load(path), True
+
+        X = extract_stylometric(texts, workers)
+        if self.enabled:
+            self._atomic(path, lambda f: np.save(f, X))
+        return X, False
+
+    def tfidf(self, texts, data_hash, make_vectorizer, params):
+        """
+        Fits make_vectorizer(**params) on texts, or loads the fitted
+        vectorizer and its matrix from an earlier run.
+        """
+        key = _cache_key("tfidf", data_hash, params, sklearn.__version__)
+        vec_path = self._path("tfidf", key, ".joblib")
+        mat_path = self._path("tfidf", key, ".npz")
+
+        if self.enabled and vec_path.exists() and mat_path.exists():
+            return (joblib.load(vec_path), sparse.load_npz(mat_path)), True
+
+        vectorizer = make_vectorizer(**params)
+        X = vectorizer.fit_transform(texts)
+        if self.enabled:
+            self._atomic(mat_path, lambda f: sparse.save_npz(f, X))
+            self._atomic(vec_path, lambda f: joblib.dump(vectorizer, f))
+        return (vectorizer, X), False
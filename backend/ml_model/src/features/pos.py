@@ -0,0 +1,122 @@
+import json
+from collections import Counter, defaultdict
+
+import nltk
+
+# Coarse classes feeding noun_ratio, verb_ratio, adj_ratio, adv_ratio.
+# Everything else (punctuation, determiners, numbers, ...) is "O".
+NOUN, VERB, ADJ, ADV, OTHER = "N", "V", "J", "R", "O"
+
+_RATIO_COLUMNS = {NOUN: 0, VERB: 1, ADJ: 2, ADV: 3}
+
+# Penn Treebank tag prefix -> coarse class
+_PTB_PREFIXES = {"NN": NOUN, "VB": VERB, "JJ": ADJ, "RB": ADV}
+
+
+def coarse_tag(ptb_tag):
+    return _PTB_PREFIXES.get(ptb_tag[:2], OTHER)
+
+
+def count_classes(tags):
+    """
+    [nouns, verbs, adjectives, adverbs] in a coarse tag sequence.
+    """
+    out = [0, 0, 0, 0]
+    for tag in tags:
+        col = _RATIO_COLUMNS.get(tag)
+        if col is not None:
+            out[col] += 1
+    return out
+
+
+class NltkPosTagger:
+    """Reference backend: NLTK averaged perceptron tagger"""
+
+    name = "nltk"
+
+    def tag(self, words):
+        return [coarse_tag(tag) for _, tag in nltk.pos_tag(words)]
+
+    def counts(self, words):
+        return count_classes(self.tag(words))
+
+
+# Suffix rules for words missing from the lexicon, longest first
+_SUFFIX_RULES = (
+    ("ically", ADV),
+    ("ness", NOUN), ("ment", NOUN), ("tion", NOUN), ("sion", NOUN),
+    ("ship", NOUN), ("hood", NOUN), ("ance", NOUN), ("ence", NOUN),
+    ("ity", NOUN), ("ism", NOUN), ("ist", NOUN),
+    ("able", ADJ), ("ible", ADJ), ("less", ADJ), ("ous", ADJ),
+    ("ful", ADJ), ("ive", ADJ), ("ish", ADJ), ("ical", ADJ),
+    ("ize", VERB), ("ise", VERB), ("ify", VERB), ("ing", VERB),
+    ("ed", VERB),
+    ("ly", ADV),
+)
+
+
+def _guess(word):
+    if not any(c.isalpha() for c in word):
+        return OTHER
+
+    for suffix, tag in _SUFFIX_RULES:
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            return tag
+
+    return NOUN
+
+
+class LexiconPosTagger:
+    """
+    Fast backend: word -> coarse class lookup built from the training
+    corpus with the NLTK tagger, plus suffix rules for unknown words.
+    Context-free, so ambiguous words always get their majority class.
+    """
+
+    name = "lexicon"
+
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+
+    def tag(self, words):
+        lexicon = self.lexicon
+        return [lexicon.get(w) or _guess(w) for w in words]
+
+    def counts(self, words):
+        return count_classes(self.tag(words))
+
+    @classmethod
+    def build(cls, token_lists, min_count=2):
+        """
+        Tags every token list with NLTK and keeps each word's most
+        frequent coarse class. Words seen fewer than min_count times
+        are left to the suffix rules.
+        """
+        seen = defaultdict(Counter)
+        for words in token_lists:
+            for word, tag in nltk.pos_tag(words):
+                seen[word][coarse_tag(tag)] += 1
+
+        lexicon = {}
+        for word, tags in seen.items():
+            if sum(tags.values()) >= min_count:
+                lexicon[word] = tags.most_common(1)[0][0]
+
+        return cls(lexicon)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.lexicon, f, ensure_ascii=False, sort_keys=True)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+def get_pos_tagger(backend="nltk", lexicon_path=None):
+    if backend == "nltk":
+        return NltkPosTagger()
+    if backend == "lexicon":
+        return LexiconPosTagger.load(lexicon_path)
+    raise ValueError(f"Unknown POS backend: {backend}")
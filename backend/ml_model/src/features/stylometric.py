@@ -1,43 +1,249 @@
 import re
-import nltk
+import math
+from time import perf_counter
+from functools import lru_cache
+
 from nltk.tokenize import word_tokenize, sent_tokenize
-from textstat import flesch_reading_ease, flesch_kincaid_grade
+from pyphen import Pyphen
 import numpy as np
 
-nltk.download('punkt', quiet=True)
-nltk.download('averaged_perceptron_tagger', quiet=True)
+from .pos import NltkPosTagger
+
+# NLTK data (punkt, perceptron tagger) is not fetched here;
+# see src/resources.py and ensure_nltk_resources().
+
+# Column order of extract_batch and key order of extract_features.
+# The trained model depends on this order; append, never reorder.
+FEATURE_NAMES = (
+    'word_count',
+    'sentence_count',
+    'char_count',
+    'avg_word_length',
+    'avg_sentence_length',
+    'lexical_diversity',
+    'noun_ratio',
+    'verb_ratio',
+    'adj_ratio',
+    'adv_ratio',
+    'flesch_reading_ease',
+    'flesch_kincaid_grade',
+    'function_word_ratio',
+    'capital_ratio',
+    'digit_ratio',
+)
+
+# Part of the training feature cache key (src/feature_cache.py);
+# bump whenever a feature's definition or rounding changes
+EXTRACTOR_VERSION = 1
+
+FUNCTION_WORDS = frozenset(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'])
+
+# ==================================================
+# Readability (same formulas and rounding as textstat 0.7.3, en_US)
+# ==================================================
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_TEXTSTAT_SENTENCE_RE = re.compile(r'\b[^.!?]+[.!?]*', re.UNICODE)
+
+_pyphen = Pyphen(lang='en_US')
+
+
+@lru_cache(maxsize=65536)
+def _word_syllables(word):
+    return len(_pyphen.positions(word)) + 1
+
+
+def _legacy_round(number, points):
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+
+def _readability(text, lower=None):
+    """
+    Returns (flesch_reading_ease, flesch_kincaid_grade) from one set of
+    word, sentence and syllable counts instead of two textstat calls.
+    lower is text.lower(), if the caller already has it.
+    """
+    stripped = _PUNCT_RE.sub('', text)
+    lexicon = len(stripped.split())
+
+    sentences = _TEXTSTAT_SENTENCE_RE.findall(text)
+    ignored = sum(1 for s in sentences if len(_PUNCT_RE.sub('', s).split()) <= 2)
+    sentence_count = max(1, len(sentences) - ignored)
+
+    # Stripping punctuation commutes with lower() for ASCII text only
+    # (lowering can turn a letter into letter + combining mark)
+    if text.isascii():
+        stripped_lower = stripped.lower()
+    else:
+        stripped_lower = _PUNCT_RE.sub('', lower if lower is not None else text.lower())
+    syllables = sum(_word_syllables(w) for w in stripped_lower.split())
+
+    asl = _legacy_round(float(lexicon / sentence_count), 1)
+    asw = _legacy_round(float(syllables) / float(lexicon), 1) if lexicon else 0.0
+
+    fre = _legacy_round(206.835 - float(1.015 * asl) - float(84.6 * asw), 2)
+    fkg = _legacy_round(float(0.39 * asl) + float(11.8 * asw) - 15.59, 1)
+    return fre, fkg
+
+
+# ==================================================
+# Sentence statistics
+# ==================================================
+
+# Terminal punctuation and the closing quotes / brackets after it,
+# which punkt keeps on each sentence
+_SENTENCE_END_RE = re.compile(r"""[.!?]+["'\u201d\u2019)\]]*$""")
+
+
+class SentenceStats:
+    """
+    Per-sentence statistics of one text, computed once from the
+    punkt sentences and shared by the stylometric features and the
+    LLM-Rewritten heuristic (app/model.py).
+
+    words       - whitespace-separated words per sentence
+    word_length - mean characters per word (0 for empty sentences)
+    chars       - characters of the stripped sentence
+
+    Sentences are measured without their terminal punctuation and
+    closing quotes, as the rewrite thresholds were tuned on a split
+    that dropped them.
+    """
+
+    __slots__ = ("words", "word_length", "chars")
+
+    def __init__(self, words, word_length, chars):
+        self.words = words
+        self.word_length = word_length
+        self.chars = chars
+
+    def __len__(self):
+        return len(self.words)
+
+    @classmethod
+    def from_sentences(cls, sentences):
+        sentences = [_SENTENCE_END_RE.sub('', s.strip()) for s in sentences]
+        n = len(sentences)
+        words = np.fromiter((len(s.split()) for s in sentences), dtype=np.int64, count=n)
+        # Characters inside words = sentence length minus whitespace
+        letters = np.fromiter((len(''.join(s.split())) for s in sentences), dtype=np.float64, count=n)
+        chars = np.fromiter((len(s.strip()) for s in sentences), dtype=np.int64, count=n)
+        return cls(words, letters / np.maximum(words, 1), chars)
+
+    @classmethod
+    def concat(cls, stats):
+        return cls(
+            np.concatenate([s.words for s in stats]),
+            np.concatenate([s.word_length for s in stats]),
+            np.concatenate([s.chars for s in stats]),
+        )
+
 
 class StylometricExtractor:
     """Extract stylometric features from text"""
 
+    feature_names = FEATURE_NAMES
+
+    def __init__(self, pos_tagger=None):
+        # NLTK perceptron by default; see features/pos.py for the
+        # faster lexicon backend
+        self.pos_tagger = pos_tagger or NltkPosTagger()
+
+    @staticmethod
+    def tokenize(text, lower=None):
+        """
+        (words, sentences) as used by the features: words from the
+        lowered text, sentences from the original. Punkt is
+        case-sensitive, so the two cannot share one pass.
+        """
+        if lower is None:
+            lower = text.lower()
+        return word_tokenize(lower), sent_tokenize(text)
+
     def extract_features(self, text):
-        features = {}
+        return dict(zip(FEATURE_NAMES, self._feature_row(text)[0]))
+
+    def extract_batch(self, texts):
+        """
+        Feature matrix for many texts, float32 (what the forest reads),
+        columns in FEATURE_NAMES order.
+        """
+        return self.analyze_batch(texts)[0].astype(np.float32)
+
+    def analyze_batch(self, texts, timings=None, tokens=None):
+        """
+        Float64 feature matrix (the values extract_features returns)
+        plus the SentenceStats of every text.
+
+        tokens: optional (lower, words, sentences) per text, from an
+        earlier tokenize() pass (app/analysis.py), so nothing is
+        tokenized twice.
+
+        If a dict is passed as timings, the seconds spent in
+        "tokenize" (only when tokens is not given), "pos" and
+        "readability" are added to it.
+        """
+        X = np.zeros((len(texts), len(FEATURE_NAMES)), dtype=np.float64)
+        stats = []
+        for i, text in enumerate(texts):
+            X[i], sentence_stats = self._feature_row(text, timings, tokens[i] if tokens else None)
+            stats.append(sentence_stats)
+        return X, stats
+
+    def _feature_row(self, text, timings=None, tokens=None):
+        t0 = perf_counter()
 
-        words = word_tokenize(text.lower())
-        sentences = sent_tokenize(text)
+        if tokens is None:
+            lower = text.lower()
+            words, sentences = self.tokenize(text, lower)
+        else:
+            lower, words, sentences = tokens
+        n_sentences = len(sentences)
 
-        features['word_count'] = len(words)
-        features['sentence_count'] = len(sentences)
-        features['char_count'] = len(text)
-        features['avg_word_length'] = np.mean([len(w) for w in words]) if words else 0
-        features['avg_sentence_length'] = len(words) / len(sentences) if sentences else 0
+        n_words = len(words)
+        n_chars = len(text)
 
-        unique_words = set(words)
-        features['lexical_diversity'] = len(unique_words) / len(words) if words else 0
+        t1 = perf_counter()
+        pos_counts = self.pos_tagger.counts(words) if n_words else None
+        t2 = perf_counter()
+        fre, fkg = _readability(text, lower)
+        t3 = perf_counter()
 
-        pos_tags = nltk.pos_tag(words)
-        features['noun_ratio'] = sum(1 for _, tag in pos_tags if tag.startswith('NN')) / len(words) if words else 0
-        features['verb_ratio'] = sum(1 for _, tag in pos_tags if tag.startswith('VB')) / len(words) if words else 0
-        features['adj_ratio'] = sum(1 for _, tag in pos_tags if tag.startswith('JJ')) / len(words) if words else 0
-        features['adv_ratio'] = sum(1 for _, tag in pos_tags if tag.startswith('RB')) / len(words) if words else 0
+        if timings is not None:
+            if tokens is None:
+                timings["tokenize"] = timings.get("tokenize", 0.0) + (t1 - t0)
+            timings["pos"] = timings.get("pos", 0.0) + (t2 - t1)
+            timings["readability"] = timings.get("readability", 0.0) + (t3 - t2)
 
-        features['flesch_reading_ease'] = flesch_reading_ease(text)
-        features['flesch_kincaid_grade'] = flesch_kincaid_grade(text)
+        if n_words:
+            avg_word_length = sum(map(len, words)) / n_words
+            lexical_diversity = len(set(words)) / n_words
+            function_word_ratio = sum(1 for w in words if w in FUNCTION_WORDS) / n_words
 
-        function_words = ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for']
-        features['function_word_ratio'] = sum(1 for w in words if w in function_words) / len(words) if words else 0
+            pos_ratios = [c / n_words for c in pos_counts]
+        else:
+            avg_word_length = lexical_diversity = function_word_ratio = 0
+            pos_ratios = [0, 0, 0, 0]
 
-        features['capital_ratio'] = sum(1 for c in text if c.isupper()) / len(text) if text else 0
-        features['digit_ratio'] = sum(1 for c in text if c.isdigit()) / len(text) if text else 0
+        if n_chars:
+            capital_ratio = sum(map(str.isupper, text)) / n_chars
+            digit_ratio = sum(map(str.isdigit, text)) / n_chars
+        else:
+            capital_ratio = digit_ratio = 0
 
-        return features
+        row = [
+            n_words,
+            n_sentences,
+            n_chars,
+            avg_word_length,
+            n_words / n_sentences if n_sentences else 0,
+            lexical_diversity,
+            *pos_ratios,
+            fre,
+            fkg,
+            function_word_ratio,
+            capital_ratio,
+            digit_ratio,
+        ]
+        return row, SentenceStats.from_sentences(sentences)
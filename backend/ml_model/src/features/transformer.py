@@ -1,26 +1,121 @@
+import hashlib
+from pathlib import Path
+
 from transformers import AutoTokenizer, AutoModel
 import torch
 import numpy as np
 
 class TransformerFeatureExtractor:
-    """Extract embeddings from DistilBERT"""
+    """
+    Extract [CLS] embeddings from DistilBERT.
+
+    extract_batch tokenizes without padding, sorts texts by token
+    length and pads each batch only to its longest member, so short
+    texts no longer pay for a full 512-token forward pass. Padded
+    positions are masked out by the attention mask, so the embedding
+    of a text does not depend on what it was batched with (up to
+    float rounding).
+
+    precision: 'fp32', or 'int8' for dynamic int8 quantization of the
+        Linear layers (weights stored as int8, activations quantized
+        per batch). CPU only; benchmarks/quantization.py measures the
+        speed-up and the accuracy cost against fp32.
+    cache_dir: optional directory of per-text .npy embeddings keyed by
+        a hash of the model name, precision, max_length and text.
+    num_threads: torch intra-op threads while extracting (torch's
+        setting is process-wide; the previous value is restored).
+    """
+
+    PRECISIONS = ('fp32', 'int8')
+
+    def __init__(self, model_name='distilbert-base-uncased', precision='fp32',
+                 cache_dir=None, num_threads=None):
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
 
-    def __init__(self, model_name='distilbert-base-uncased'):
+        self.model_name = model_name
+        self.precision = precision
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.model = AutoModel.from_pretrained(model_name)
         self.model.eval()
 
+        if precision == 'int8':
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.num_threads = num_threads
+
     def extract_features(self, text, max_length=512):
-        inputs = self.tokenizer(
-            text,
-            max_length=max_length,
-            truncation=True,
-            padding='max_length',
-            return_tensors='pt'
-        )
-
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            embeddings = outputs.last_hidden_state[:, 0, :].numpy()
-
-        return embeddings.flatten()
+        return self.extract_batch([text], max_length=max_length)[0]
+
+    # ----------------------------------------------
+    # Batched extraction
+    # ----------------------------------------------
+
+    def _cache_path(self, text, max_length):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.model_name}\0{self.precision}\0{max_length}\0".encode())
+        digest.update(text.encode("utf-8"))
+        key = digest.hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def _embed(self, texts, batch_size, max_length):
+        encoded = self.tokenizer(texts, max_length=max_length, truncation=True)["input_ids"]
+
+        # Longest first: similar lengths share a batch, and a too-large
+        # batch fails on the first iteration rather than the last
+        order = sorted(range(len(texts)), key=lambda i: len(encoded[i]), reverse=True)
+        out = np.empty((len(texts), self.model.config.hidden_size), dtype=np.float32)
+
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                rows = order[start:start + batch_size]
+                inputs = self.tokenizer.pad(
+                    {"input_ids": [encoded[i] for i in rows]},
+                    return_tensors='pt'
+                )
+                outputs = self.model(**inputs)
+                out[rows] = outputs.last_hidden_state[:, 0, :].numpy()
+
+        return out
+
+    def extract_batch(self, texts, batch_size=32, max_length=512):
+        """
+        (n_texts, hidden_size) float32 matrix of [CLS] embeddings, in
+        input order.
+        """
+        texts = list(texts)
+        out = np.empty((len(texts), self.model.config.hidden_size), dtype=np.float32)
+
+        missing = list(range(len(texts)))
+        if self.cache_dir:
+            paths = [self._cache_path(t, max_length) for t in texts]
+            missing = []
+            for i, path in enumerate(paths):
+                if path.exists():
+                    out[i] = np.load(path)
+                else:
+                    missing.append(i)
+
+        if not missing:
+            return out
+
+        previous_threads = torch.get_num_threads()
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        try:
+            embedded = self._embed([texts[i] for i in missing], batch_size, max_length)
+        finally:
+            torch.set_num_threads(previous_threads)
+
+        out[missing] = embedded
+        if self.cache_dir:
+            for i, row in zip(missing, embedded):
+                paths[i].parent.mkdir(exist_ok=True)
+                np.save(paths[i], row)
+
+        return out
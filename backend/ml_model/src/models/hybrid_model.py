@@ -44,3 +44,37 @@ class HybridTextClassifier:
         self.model = joblib.load(f"{path_prefix}_model.pkl")
         self.scaler = joblib.load(f"{path_prefix}_scaler.pkl")
         self.label_encoder = joblib.load(f"{path_prefix}_encoder.pkl")
+        return self
+
+
+class HybridDetector:
+    """
+    Texts in, labels out: stylometric features and DistilBERT [CLS]
+    embeddings fed to a saved HybridTextClassifier.
+
+    precision selects the transformer at load time: 'fp32', or 'int8'
+    (dynamic quantization, for CPU-only inference nodes).
+    """
+
+    def __init__(self, path_prefix, precision='fp32', num_threads=None, cache_dir=None):
+        from ..features.stylometric import StylometricExtractor
+        from ..features.transformer import TransformerFeatureExtractor
+
+        self.classifier = HybridTextClassifier().load(path_prefix)
+        self.stylometric_extractor = StylometricExtractor()
+        self.transformer_extractor = TransformerFeatureExtractor(
+            precision=precision, num_threads=num_threads, cache_dir=cache_dir
+        )
+
+    def features(self, texts):
+        texts = list(texts)
+        return (
+            self.stylometric_extractor.extract_batch(texts),
+            self.transformer_extractor.extract_batch(texts),
+        )
+
+    def predict(self, texts):
+        return self.classifier.predict(*self.features(texts))
+
+    def predict_proba(self, texts):
+        return self.classifier.predict_proba(*self.features(texts))
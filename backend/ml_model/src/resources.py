@@ -0,0 +1,37 @@
+import nltk
+
+# NLTK data used by the feature extractors: name -> nltk.data path
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "averaged_perceptron_tagger": "taggers/averaged_perceptron_tagger",
+}
+
+
+def missing_nltk_resources():
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+
+def ensure_nltk_resources(download=False):
+    """
+    Checks the local NLTK data. Missing resources are downloaded only
+    when download=True; otherwise a LookupError names them, so nothing
+    touches the network unless asked to.
+    """
+    missing = missing_nltk_resources()
+
+    if missing and download:
+        for name in missing:
+            nltk.download(name, quiet=True)
+        missing = missing_nltk_resources()
+
+    if missing:
+        raise LookupError(
+            "Missing NLTK data: " + ", ".join(missing)
+            + " (run: python -m app.bootstrap)"
+        )
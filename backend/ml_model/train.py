@@ -1,5 +1,6 @@
+import argparse
+
 import pandas as pd
-import numpy as np
 import joblib
 from pathlib import Path
 
@@ -10,7 +11,8 @@ from sklearn.metrics import classification_report
 from sklearn.feature_extraction.text import TfidfVectorizer
 from scipy.sparse import hstack, csr_matrix
 
-from src.features.stylometric import StylometricExtractor
+from src.feature_cache import FeatureCache, dataset_hash
+from src.resources import ensure_nltk_resources
 
 # ==================================================
 # Paths (LOCKED & CORRECT)
@@ -21,116 +23,143 @@ PROJECT_ROOT = BASE_DIR.parent                             # ai-text-detector/
 DATA_PATH = PROJECT_ROOT / "dataset_balanced.csv"          # ✅ FIXED
 
 MODEL_DIR = BASE_DIR / "models"
-MODEL_DIR.mkdir(parents=True, exist_ok=True)
+FEATURE_CACHE_DIR = MODEL_DIR / "feature_cache"
 
-print("📁 Saving models to:", MODEL_DIR.resolve())
-print("📄 Training dataset:", DATA_PATH.resolve())
+TFIDF_PARAMS = dict(
+    ngram_range=(1, 3),
+    max_features=20000,     # ✅ reduced
+    min_df=3,
+    stop_words="english"
+)
 
-# ==================================================
-# Load dataset
-# ==================================================
 
-df = pd.read_csv(DATA_PATH)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train the text origin model")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="processes for stylometric extraction (0 = one per CPU)")
+    parser.add_argument("--cache-dir", type=Path, default=FEATURE_CACHE_DIR,
+                        help="where extracted feature matrices are cached")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-extract features and don't write the cache")
+    return parser.parse_args(argv)
 
-print("\nDataset loaded:", df.shape)
-print(df["label"].value_counts())
 
-# ==================================================
-# Encode labels
-# ==================================================
+def main(argv=None):
+    args = parse_args(argv)
 
-label_encoder = LabelEncoder()
-y = label_encoder.fit_transform(df["label"])
+    MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
-joblib.dump(label_encoder, MODEL_DIR / "label_encoder.pkl")
+    print("📁 Saving models to:", MODEL_DIR.resolve())
+    print("📄 Training dataset:", DATA_PATH.resolve())
 
-# ==================================================
-# Stylometric features
-# ==================================================
+    # ==================================================
+    # Load dataset
+    # ==================================================
 
-stylometric_extractor = StylometricExtractor()
+    df = pd.read_csv(DATA_PATH)
+    texts = df["text"].tolist()
 
-X_style_dense = np.array([
-    list(stylometric_extractor.extract_features(text).values())
-    for text in df["text"]
-])
+    print("\nDataset loaded:", df.shape)
+    print(df["label"].value_counts())
 
-X_style = csr_matrix(X_style_dense)
+    cache = FeatureCache(args.cache_dir, enabled=not args.no_cache)
+    data_hash = dataset_hash(texts)
 
-print("Stylometric feature shape:", X_style.shape)
+    # ==================================================
+    # Encode labels
+    # ==================================================
 
-# ==================================================
-# TF-IDF features (CLEAN & CONTROLLED)
-# ==================================================
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(df["label"])
 
-tfidf = TfidfVectorizer(
-    ngram_range=(1, 3),
-    max_features=20000,     # ✅ reduced
-    min_df=3,
-    stop_words="english"
-)
+    joblib.dump(label_encoder, MODEL_DIR / "label_encoder.pkl")
 
-X_tfidf = tfidf.fit_transform(df["text"])
+    # ==================================================
+    # Stylometric features
+    # ==================================================
 
-joblib.dump(tfidf, MODEL_DIR / "tfidf_vectorizer.pkl")
+    ensure_nltk_resources(download=True)
 
-print("TF-IDF feature shape:", X_tfidf.shape)
+    X_style_dense, hit = cache.stylometric(texts, data_hash, workers=args.workers)
 
-# ==================================================
-# Combine features
-# ==================================================
+    X_style = csr_matrix(X_style_dense)
 
-X = hstack([X_tfidf, X_style])
+    print("Stylometric feature shape:", X_style.shape, "(cached)" if hit else "")
 
-print("Final feature matrix shape:", X.shape)
+    # ==================================================
+    # TF-IDF features (CLEAN & CONTROLLED)
+    # ==================================================
 
-# ==================================================
-# Train / validation split
-# ==================================================
+    (tfidf, X_tfidf), hit = cache.tfidf(texts, data_hash, TfidfVectorizer, TFIDF_PARAMS)
 
-X_train, X_val, y_train, y_val = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    random_state=42,
-    stratify=y
-)
+    # Older sklearn releases keep every n-gram pruned by max_features /
+    # min_df in stop_words_; transform() never reads it
+    if hasattr(tfidf, "stop_words_"):
+        del tfidf.stop_words_
 
-# ==================================================
-# Model
-# ==================================================
+    joblib.dump(tfidf, MODEL_DIR / "tfidf_vectorizer.pkl")
 
-model = RandomForestClassifier(
-    n_estimators=400,
-    min_samples_leaf=2,
-    class_weight="balanced",
-    n_jobs=-1,
-    random_state=42
-)
+    print("TF-IDF feature shape:", X_tfidf.shape, "(cached)" if hit else "")
 
-model.fit(X_train, y_train)
+    # ==================================================
+    # Combine features
+    # ==================================================
 
-# ==================================================
-# Evaluation
-# ==================================================
+    X = hstack([X_tfidf, X_style])
 
-y_pred = model.predict(X_val)
+    print("Final feature matrix shape:", X.shape)
 
-print("\n📊 Classification Report:\n")
-print(classification_report(
-    y_val,
-    y_pred,
-    target_names=label_encoder.classes_
-))
+    # ==================================================
+    # Train / validation split
+    # ==================================================
 
-# ==================================================
-# Save model
-# ==================================================
+    X_train, X_val, y_train, y_val = train_test_split(
+        X,
+        y,
+        test_size=0.2,
+        random_state=42,
+        stratify=y
+    )
+
+    # ==================================================
+    # Model
+    # ==================================================
+
+    model = RandomForestClassifier(
+        n_estimators=400,
+        min_samples_leaf=2,
+        class_weight="balanced",
+        n_jobs=-1,
+        random_state=42
+    )
+
+    model.fit(X_train, y_train)
+
+    # ==================================================
+    # Evaluation
+    # ==================================================
+
+    y_pred = model.predict(X_val)
+
+    print("\n📊 Classification Report:\n")
+    print(classification_report(
+        y_val,
+        y_pred,
+        target_names=label_encoder.classes_
+    ))
+
+    # ==================================================
+    # Save model
+    # ==================================================
+
+    joblib.dump(model, MODEL_DIR / "text_origin_model.pkl")
+
+    print("\n✅ FINAL TRAINING COMPLETE")
+    print("📦 Files saved:")
+    print(" - text_origin_model.pkl")
+    print(" - tfidf_vectorizer.pkl")
+    print(" - label_encoder.pkl")
 
-joblib.dump(model, MODEL_DIR / "text_origin_model.pkl")
 
-print("\n✅ FINAL TRAINING COMPLETE")
-print("📦 Files saved:")
-print(" - text_origin_model.pkl")
-print(" - tfidf_vectorizer.pkl")
-print(" - label_encoder.pkl")
+if __name__ == "__main__":
+    main()
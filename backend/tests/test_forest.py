@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from scipy.sparse import random as sparse_random
+from sklearn.ensemble import RandomForestClassifier
+
+from app.forest import FlatForest
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.RandomState(0)
+    X = sparse_random(400, 60, density=0.15, format="csr", random_state=rng, dtype=np.float64)
+    y = (X[:, :5].sum(axis=1).A.ravel() > 0.3).astype(int) + (X[:, 7].toarray().ravel() > 0.5)
+
+    model = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+    X_test = sparse_random(80, 60, density=0.15, format="csr", random_state=rng, dtype=np.float64)
+    return model, FlatForest.from_sklearn(model), X_test
+
+
+def _sklearn_path_contributions(model, x, class_idx):
+    # Change in class probability at every split along each tree's
+    # decision path, averaged over trees
+    contrib = np.zeros(model.n_features_in_)
+    for est in model.estimators_:
+        tree = est.tree_
+        value = tree.value[:, 0, :] / tree.value[:, 0, :].sum(axis=1, keepdims=True)
+        path = est.decision_path(x).indices
+        for node, nxt in zip(path[:-1], path[1:]):
+            contrib[tree.feature[node]] += (value[nxt, class_idx] - value[node, class_idx]) / len(model.estimators_)
+    return contrib
+
+
+def test_predict_proba_matches_sklearn(fitted):
+    model, forest, X = fitted
+    np.testing.assert_allclose(forest.predict_proba(X), model.predict_proba(X), atol=1e-12)
+
+
+def test_single_row_matches_sklearn(fitted):
+    model, forest, X = fitted
+    for i in range(5):
+        np.testing.assert_allclose(forest.predict_proba(X[i]), model.predict_proba(X[i]), atol=1e-12)
+
+
+def test_path_contributions_match_sklearn(fitted):
+    model, forest, X = fitted
+    for i in range(10):
+        for class_idx in range(forest.n_classes):
+            np.testing.assert_allclose(
+                forest.path_contributions(X[i], class_idx),
+                _sklearn_path_contributions(model, X[i], class_idx),
+                atol=1e-12
+            )
+
+
+def test_subsets_average_to_full_forest(fitted):
+    _, forest, X = fitted
+    k, n = 10, forest.n_trees
+    combined = (k * forest.subset(0, k).predict_proba(X) + (n - k) * forest.subset(k, n).predict_proba(X)) / n
+    np.testing.assert_allclose(combined, forest.predict_proba(X), atol=1e-12)
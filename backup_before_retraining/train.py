@@ -37,7 +37,7 @@ def train_model():
 
     # Feature extractors
     stylometric_extractor = StylometricExtractor()
-    transformer_extractor = TransformerFeatureExtractor()
+    transformer_extractor = TransformerFeatureExtractor(cache_dir=MODEL_DIR / "embedding_cache")
 
     print("\n🔍 Extracting stylometric features...")
     X_style = np.array([
@@ -46,12 +46,7 @@ def train_model():
     ])
 
     print("🤖 Extracting transformer embeddings...")
-    X_trans = []
-    for i, text in enumerate(df["text"]):
-        if i % 100 == 0:
-            print(f"Processed {i}/{len(df)}")
-        X_trans.append(transformer_extractor.extract_features(text))
-    X_trans = np.array(X_trans)
+    X_trans = transformer_extractor.extract_batch(df["text"].tolist())
 
     # Train-test split
     (